@@ -20,18 +20,39 @@ from pathlib import Path
 import emoji
 
 # Import from current directory
-from chatline import Chatline
 from font_color import Color
 import config
+from stopwords import get_stop_words, make_word_filter
+from message_arrays import MessageArrays
+from sessions import sessionize
+from interactions import InteractionMatrix
+from export_pipeline import ExportPipeline, json_default
+from message_stream import iter_chatlines, read_chatlines, write_ndjson
+from columnar_export import default_suffix, write_columnar
+from html_report import write_report
+from analytics_store import AnalyticsStore
+from reply_analyzer import ReplyAnalyzer
+from compressed_io import CODECS, available_codecs, open_output, output_suffix
+
+EXPORT_LABELS = {
+    'json': 'JSON',
+    'csv': 'CSV',
+    'html': 'HTML report',
+    'ndjson': 'Messages (NDJSON)',
+    'columnar': 'Messages (columnar)'
+}
 
 class AdvancedAnalyzer:
     """Advanced WhatsApp Chat Analyzer with enhanced features"""
     
     def __init__(self, file_path, stop_words=None, debug=False):
         self.file_path = file_path
-        self.stop_words = stop_words or []
+        self.stop_words = frozenset(stop_words or ())
+        self._is_countable = make_word_filter(self.stop_words)
         self.debug = debug
         self.lines = []
+        self.messages = None
+        self.chatlines = None  # Parsed lines with a type, kept by parse_chats for the message exporters
         self.chat_data = {
             'chat_count': 0,
             'deleted_chat_count': 0,
@@ -44,13 +65,21 @@ class AdvancedAnalyzer:
             'emojis': [],
             'fav_emoji': [],
             'fav_word': [],
-            'conversations': defaultdict(list),
+            'conversations': None,
             'response_times': defaultdict(list),
             'daily_activity': defaultdict(int),
             'hourly_activity': defaultdict(int),
-            'sender_interactions': defaultdict(lambda: defaultdict(int))
+            'sender_interactions': None
         }
         
+        # Exporters share one statistics snapshot per export run
+        self.export_pipeline = ExportPipeline()
+        self.export_pipeline.register('json', self.export_json)
+        self.export_pipeline.register('csv', self.export_csv)
+        self.export_pipeline.register('html', self.export_html)
+        self.export_pipeline.register('ndjson', self.export_messages)
+        self.export_pipeline.register('columnar', self.export_columnar)
+        
     def load_file(self):
         """Load chat file"""
         try:
@@ -68,18 +97,20 @@ class AdvancedAnalyzer:
         print("📊 Parsing and Analyzing Chats...")
         print(f"{'='*60}\n")
         
-        previous_line = None
         last_sender = None
         last_timestamp = None
+        message_senders = []
+        message_times = []
+        chatlines = []
         
         total = len(self.lines)
-        for idx, line in enumerate(self.lines):
+        for idx, chatline in enumerate(iter_chatlines(self.lines, self.debug)):
             if idx % 100 == 0:
                 progress = (idx / total) * 100
                 print(f"\rProgress: {progress:.1f}% ({idx}/{total} lines)", end='')
             
-            chatline = Chatline(line=line, previous_line=previous_line, debug=self.debug)
-            previous_line = chatline
+            if chatline.line_type is not None:
+                chatlines.append(chatline)
             
             # Counter
             if chatline.line_type == 'Chat':
@@ -91,10 +122,6 @@ class AdvancedAnalyzer:
                         time_diff = (chatline.timestamp - last_timestamp).total_seconds()
                         if 0 < time_diff < 3600:  # Within 1 hour
                             self.chat_data['response_times'][chatline.sender].append(time_diff)
-                            
-                # Sender interaction matrix
-                if last_sender and chatline.sender and last_sender != chatline.sender:
-                    self.chat_data['sender_interactions'][last_sender][chatline.sender] += 1
             
             if chatline.line_type == 'Event':
                 self.chat_data['event_count'] += 1
@@ -127,9 +154,10 @@ class AdvancedAnalyzer:
                 self.chat_data['daily_activity'][date_key] += 1
                 self.chat_data['hourly_activity'][hour_key] += 1
                 
-                # Conversation grouping (messages within 30 minutes)
-                conv_key = chatline.timestamp.replace(minute=chatline.timestamp.minute // 30 * 30, second=0)
-                self.chat_data['conversations'][conv_key].append(chatline)
+                # Message arrays for conversation sessionization
+                if chatline.sender:
+                    message_senders.append(chatline.sender)
+                    message_times.append(chatline.timestamp)
             
             if len(chatline.words) > 0:
                 self.chat_data['words'].extend(chatline.words)
@@ -140,6 +168,15 @@ class AdvancedAnalyzer:
             if len(chatline.domains) > 0:
                 self.chat_data['domains'].extend(chatline.domains)
         
+        self.chatlines = chatlines
+        
+        # Conversations are split on inactivity gaps
+        self.messages = MessageArrays.from_columns(message_times, message_senders)
+        self.chat_data['conversations'] = sessionize(self.messages)
+        
+        # Sender interaction matrix over consecutive-sender pairs
+        self.chat_data['sender_interactions'] = InteractionMatrix.from_arrays(self.messages)
+        
         print(f"\r✓ Completed parsing {total} lines\n")
     
     def process_data(self):
@@ -191,22 +228,12 @@ class AdvancedAnalyzer:
     
     def _filter_words(self, word_list):
         """Filter words based on criteria"""
-        return [
-            w.lower() for w in word_list 
-            if (len(w) > config.MIN_WORD_LENGTH) 
-            and w.isalnum() 
-            and not w.isnumeric() 
-            and w.lower() not in self.stop_words
-        ]
+        is_countable = self._is_countable
+        return [w.lower() for w in word_list if is_countable(w)]
     
     def _filter_single_word(self, word):
         """Filter a single word"""
-        return (
-            len(word) > config.MIN_WORD_LENGTH 
-            and word.isalnum() 
-            and not word.isnumeric() 
-            and word.lower() not in self.stop_words
-        )
+        return self._is_countable(word)
     
     def _reduce_fav_item(self, data):
         """Reduce favorite items per person"""
@@ -240,8 +267,9 @@ class AdvancedAnalyzer:
             'domains': self.chat_data['domains'][:config.DEFAULT_TOP_N],
             'response_times': self._calculate_avg_response_times(),
             'conversations': len(self.chat_data['conversations']),
+            'conversation_starters': self.chat_data['conversations'].initiator_counts()[:config.DEFAULT_TOP_N],
             'peak_hours': self._get_peak_hours(),
-            'sender_interactions': dict(self.chat_data['sender_interactions'])
+            'sender_interactions': self.chat_data['sender_interactions'].to_dict()
         }
         return stats
     
@@ -285,247 +313,141 @@ class AdvancedAnalyzer:
             reverse=True
         )[:5]
     
-    def export_json(self, output_path=None):
-        """Export analysis to JSON"""
+    def _parsed_lines(self):
+        """Parsed lines of the chat: the ones kept by parse_chats, else a fresh stream of the file"""
+        if self.chatlines is not None:
+            return self.chatlines
+        return read_chatlines(self.file_path, self.debug)
+    
+    def export(self, formats=None, compress=None):
+        """
+        Run several exporters from one statistics snapshot, concurrently
+        compress ('gzip' or 'zstd') is passed on to every exporter
+        Returns {format: output path}
+        """
+        return self.export_pipeline.run(self.get_statistics, formats, compress=compress)
+    
+    def export_json(self, output_path=None, stats=None, compress=None):
+        """Export analysis to JSON (gzip/zstd with compress or a .gz/.zst path)"""
         if output_path is None:
-            output_path = config.EXPORT_DIR / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_path = config.EXPORT_DIR / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json{output_suffix(compress)}"
         
-        stats = self.get_statistics()
+        if stats is None:
+            stats = self.get_statistics()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False, default=str)
+        with open_output(output_path, compress) as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False, default=json_default)
         
-        print(f"✓ JSON exported to: {output_path}")
         return output_path
     
-    def export_csv(self, output_path=None):
-        """Export analysis to CSV"""
+    def export_csv(self, output_path=None, stats=None, compress=None):
+        """Export analysis to CSV (gzip/zstd with compress or a .gz/.zst path)"""
         if output_path is None:
-            output_path = config.EXPORT_DIR / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            output_path = config.EXPORT_DIR / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv{output_suffix(compress)}"
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        if stats is None:
+            stats = self.get_statistics()
+        
+        with open_output(output_path, compress, newline='') as f:
             writer = csv.writer(f)
             
             # Senders
             writer.writerow(['Senders Statistics'])
             writer.writerow(['Sender', 'Message Count'])
-            for sender, count in self.chat_data['senders'][:config.DEFAULT_TOP_N]:
+            for sender, count in stats['senders']:
                 writer.writerow([sender, count])
             writer.writerow([])
             
             # Words
             writer.writerow(['Word Statistics'])
             writer.writerow(['Word', 'Count'])
-            for word, count in self.chat_data['words'][:config.DEFAULT_TOP_N]:
+            for word, count in stats['words']:
                 writer.writerow([word, count])
             writer.writerow([])
             
             # Emojis
             writer.writerow(['Emoji Statistics'])
             writer.writerow(['Emoji', 'Count'])
-            for emoji_char, count in self.chat_data['emojis'][:config.DEFAULT_TOP_N]:
+            for emoji_char, count in stats['emojis']:
                 writer.writerow([emoji_char, count])
         
-        print(f"✓ CSV exported to: {output_path}")
         return output_path
     
-    def export_html(self, output_path=None):
-        """Export analysis to HTML report"""
+    def export_messages(self, output_path=None, stats=None, compress=None):
+        """
+        Export every parsed message as newline-delimited JSON, streamed
+        from the lines parse_chats already parsed (the file is only parsed
+        here if it has not been yet); compress with compress='gzip'/'zstd'
+        (True means gzip) or a .gz/.zst path
+        """
+        if output_path is None:
+            output_path = config.EXPORT_DIR / f"messages_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson{output_suffix(compress)}"
+        
+        write_ndjson(self._parsed_lines(), output_path, compress)
+        
+        return output_path
+    
+    def export_columnar(self, output_path=None, stats=None, compress=None):
+        """
+        Export every parsed message to a columnar file for notebooks:
+        Parquet when pyarrow is installed, .npz otherwise
+        (load it back with columnar_export.load_dataframe)
+        compress is ignored: Parquet pages are compressed already and the
+        .npz stays uncompressed so its columns can be memory-mapped
+        """
         if output_path is None:
-            output_path = config.REPORTS_DIR / f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            output_path = config.EXPORT_DIR / f"messages_{datetime.now().strftime('%Y%m%d_%H%M%S')}{default_suffix()}"
         
-        stats = self.get_statistics()
+        write_columnar(self._parsed_lines(), output_path)
         
-        html_content = self._generate_html_report(stats)
+        return output_path
+    
+    def export_html(self, output_path=None, stats=None, compress=None):
+        """Export analysis to HTML report (gzip/zstd with compress or a .gz/.zst path)"""
+        if output_path is None:
+            output_path = config.REPORTS_DIR / f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html{output_suffix(compress)}"
+        
+        if stats is None:
+            stats = self.get_statistics()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        write_report(stats, output_path, compress=compress)
         
-        print(f"✓ HTML report exported to: {output_path}")
         return output_path
     
-    def _generate_html_report(self, stats):
-        """Generate HTML report content"""
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>WhatsApp Chat Analysis Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }}
-        .container {{
-            background: white;
-            border-radius: 10px;
-            padding: 30px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #667eea;
-            text-align: center;
-            margin-bottom: 30px;
-        }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-        .stat-card {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            text-align: center;
-        }}
-        .stat-value {{
-            font-size: 2em;
-            font-weight: bold;
-            margin: 10px 0;
-        }}
-        .stat-label {{
-            font-size: 0.9em;
-            opacity: 0.9;
-        }}
-        .chart {{
-            margin: 30px 0;
-        }}
-        .chart h2 {{
-            color: #333;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }}
-        .bar {{
-            display: flex;
-            align-items: center;
-            margin: 10px 0;
-        }}
-        .bar-label {{
-            width: 150px;
-            font-size: 0.9em;
-        }}
-        .bar-fill {{
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            height: 25px;
-            border-radius: 5px;
-            margin: 0 10px;
-            transition: width 0.3s ease;
-        }}
-        .bar-value {{
-            font-weight: bold;
-            color: #667eea;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background: #667eea;
-            color: white;
-        }}
-        tr:hover {{
-            background: #f5f5f5;
-        }}
-        .timestamp {{
-            text-align: center;
-            color: #666;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 WhatsApp Chat Analysis Report</h1>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-label">Total Messages</div>
-                <div class="stat-value">{stats['overview']['total_chats']}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Participants</div>
-                <div class="stat-value">{stats['overview']['unique_senders']}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Unique Words</div>
-                <div class="stat-value">{stats['overview']['unique_words']}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Emojis Used</div>
-                <div class="stat-value">{stats['overview']['unique_emojis']}</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            <h2>👥 Top Senders</h2>
-            {self._generate_html_bars(stats['senders'])}
-        </div>
-        
-        <div class="chart">
-            <h2>💬 Most Used Words</h2>
-            {self._generate_html_bars(stats['words'])}
-        </div>
-        
-        <div class="chart">
-            <h2>😊 Top Emojis</h2>
-            {self._generate_html_bars(stats['emojis'])}
-        </div>
-        
-        <div class="chart">
-            <h2>🔗 Shared Domains</h2>
-            {self._generate_html_bars(stats['domains'])}
-        </div>
-        
-        <div class="timestamp">
-            Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        </div>
-    </div>
-</body>
-</html>
-"""
-        return html
-    
-    def _generate_html_bars(self, data):
-        """Generate HTML bar chart"""
-        if not data:
-            return "<p>No data available</p>"
-        
-        max_value = max([x[1] for x in data]) if data else 1
-        html = ""
-        
-        for item, count in data[:15]:
-            width_percent = (count / max_value) * 100
-            html += f"""
-            <div class="bar">
-                <div class="bar-label">{item}</div>
-                <div class="bar-fill" style="width: {width_percent}%;"></div>
-                <div class="bar-value">{count}</div>
-            </div>
-            """
-        
-        return html
+    def save_to_database(self, path=config.DATABASE_PATH, stats=None):
+        """
+        Store the parsed messages, love scores and top statistics in the
+        local analytics database, to be queried later without re-parsing
+        Returns the upload id
+        """
+        if stats is None:
+            stats = self.get_statistics()
+        
+        # Scoring and ingestion both walk the lines, so a fresh parse is kept as a list
+        chatlines = self._parsed_lines()
+        if self.chatlines is None:
+            chatlines = list(chatlines)
+        love_scores = ReplyAnalyzer([c for c in chatlines if c.line_type == 'Chat']).get_love_scores()
+        
+        with AnalyticsStore(path) as store:
+            upload_id = store.ingest(chatlines, Path(self.file_path).name)
+            store.save_analytics(upload_id, {
+                'love_scores': love_scores,
+                'top_senders': dict(stats['senders']),
+                'top_words': dict(stats['words']),
+                'hourly_activity': {str(k): v for k, v in sorted(self.chat_data['hourly_activity'].items())},
+                'daily_activity': {str(k): v for k, v in sorted(self.chat_data['daily_activity'].items())}
+            })
+        
+        print(f"✓ Chat stored as upload {upload_id} in: {path}")
+        return upload_id
 
 
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
         description='Advanced WhatsApp Chat Analyzer',
-        usage="python advanced_analyzer.py FILE [-h] [-d] [-s] [-c] [-e] [-w]"
+        usage="python advanced_analyzer.py FILE [-h] [-d] [-s] [-c] [-e] [-z] [-w] [--store]"
     )
     
     stop_words_options = [
@@ -540,25 +462,29 @@ def main():
     parser.add_argument('-d', '--debug', action="store_true", help="Debug mode")
     parser.add_argument('-s', '--stopword', choices=stop_words_options, help="Stop words language")
     parser.add_argument('-c', '--customstopword', help="Custom stop words file path")
-    parser.add_argument('-e', '--export', nargs='+', choices=['json', 'csv', 'html', 'all'],
-                       help="Export formats: json, csv, html, or all")
+    parser.add_argument('-e', '--export', nargs='+', choices=['json', 'csv', 'html', 'ndjson', 'columnar', 'all'],
+                       help="Export formats: json, csv, html, ndjson / columnar (messages), or all")
+    parser.add_argument('-z', '--compress', choices=list(CODECS),
+                        help="Compress exports (except columnar) with gzip or zstd")
+    parser.add_argument('--store', action="store_true",
+                        help="Save the chat to the local analytics database (always on with DATABASE_ENABLED)")
     parser.add_argument('--no-display', action="store_true", help="Skip terminal display")
     
     args = parser.parse_args()
+    if args.compress and args.compress not in available_codecs():
+        parser.error("zstd compression needs Python 3.14+ or the zstandard package")
     
-    # Load stop words
-    stop_words = []
+    # Load stop words (language and custom file are combined)
+    stop_words = frozenset()
     if args.stopword:
         try:
-            with io.open(f"stop-words/{args.stopword}.txt", "r", encoding="utf-8") as file:
-                stop_words = [x.strip() for x in file.readlines()]
+            stop_words |= get_stop_words(args.stopword)
         except IOError:
             print(f"Warning: Stop words file not found")
     
     if args.customstopword:
         try:
-            with io.open(args.customstopword, "r", encoding="utf-8") as file:
-                stop_words = [x.strip() for x in file.readlines()]
+            stop_words |= get_stop_words(custom_files=args.customstopword)
         except IOError:
             print(f"Warning: Custom stop words file not found")
     
@@ -602,18 +528,22 @@ def main():
         print(f"{'='*60}\n")
         
         if 'all' in args.export:
-            args.export = ['json', 'csv', 'html']
+            args.export = analyzer.export_pipeline.formats
         
-        for fmt in args.export:
-            if fmt == 'json':
-                analyzer.export_json()
-            elif fmt == 'csv':
-                analyzer.export_csv()
-            elif fmt == 'html':
-                path = analyzer.export_html()
-                print(f"   Open in browser: file:///{path}")
+        # Statistics are computed once and shared by every format
+        paths = analyzer.export(dict.fromkeys(args.export), args.compress)
+        # Exporters run on worker threads; report from here so lines never interleave
+        for name, path in paths.items():
+            print(f"✓ {EXPORT_LABELS.get(name, name)} exported to: {path}")
+        if 'html' in paths and not args.compress:
+            print(f"   Open in browser: file:///{paths['html']}")
         
         print(f"\n✓ All exports saved to: {config.EXPORT_DIR}")
+    
+    # Local analytics database
+    if args.store or config.DATABASE_ENABLED:
+        print()
+        analyzer.save_to_database()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Local Analytics Store for WhatsApp Analyzer
+SQLite mirror of the chat_uploads / chat_messages / chat_analytics
+tables of create_supabase_tables.sql, kept at config.DATABASE_PATH.
+Parsed chats are bulk-loaded once (one transaction per chat, WAL
+journal) and queried offline afterwards; aggregations run in SQL
+on the (upload_id, timestamp) and (upload_id, sender) indexes.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import config
+from export_pipeline import json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_uploads (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    total_messages INTEGER NOT NULL,
+    participant_count INTEGER NOT NULL,
+    participants TEXT NOT NULL,  -- JSON array
+    date_start TEXT,
+    date_end TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY,
+    upload_id INTEGER NOT NULL REFERENCES chat_uploads(id) ON DELETE CASCADE,
+    sender TEXT,
+    message_body TEXT,
+    timestamp TEXT,  -- 'YYYY-MM-DD HH:MM:SS'
+    line_type TEXT DEFAULT 'Chat',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS chat_analytics (
+    id INTEGER PRIMARY KEY,
+    upload_id INTEGER NOT NULL REFERENCES chat_uploads(id) ON DELETE CASCADE,
+    love_scores TEXT,  -- JSON columns
+    top_senders TEXT,
+    top_words TEXT,
+    hourly_activity TEXT,
+    daily_activity TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_upload_timestamp ON chat_messages(upload_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_upload_sender ON chat_messages(upload_id, sender);
+CREATE INDEX IF NOT EXISTS idx_chat_analytics_upload_id ON chat_analytics(upload_id);
+CREATE INDEX IF NOT EXISTS idx_chat_uploads_created_at ON chat_uploads(created_at DESC);
+
+CREATE TRIGGER IF NOT EXISTS update_chat_uploads_updated_at
+    AFTER UPDATE ON chat_uploads FOR EACH ROW
+    BEGIN UPDATE chat_uploads SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END;
+
+CREATE TRIGGER IF NOT EXISTS update_chat_analytics_updated_at
+    AFTER UPDATE ON chat_analytics FOR EACH ROW
+    BEGIN UPDATE chat_analytics SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END;
+"""
+
+ANALYTICS_COLUMNS = ('love_scores', 'top_senders', 'top_words', 'hourly_activity', 'daily_activity')
+
+
+class _UploadSummary:
+    """chat_uploads fields gathered while the messages stream past"""
+
+    def __init__(self):
+        self.total_messages = 0
+        self.participants = {}  # Insertion-ordered set
+        self.date_start = None
+        self.date_end = None
+
+    def add(self, line_type, sender, timestamp):
+        if line_type == 'Chat':
+            self.total_messages += 1
+            if sender:
+                self.participants[sender] = None
+        if timestamp is not None:
+            if self.date_start is None or timestamp < self.date_start:
+                self.date_start = timestamp
+            if self.date_end is None or timestamp > self.date_end:
+                self.date_end = timestamp
+
+
+def _message_rows(upload_id, chatlines, summary):
+    """chat_messages rows of parsed lines (lines without a type are skipped)"""
+    for chatline in chatlines:
+        if chatline.line_type is None:
+            continue
+        timestamp = None
+        if chatline.timestamp is not None:
+            timestamp = chatline.timestamp.isoformat(sep=' ', timespec='seconds')
+        summary.add(chatline.line_type, chatline.sender, timestamp)
+        yield upload_id, chatline.sender, chatline.body, timestamp, chatline.line_type
+
+
+def _upload_filter(upload_id, line_type):
+    clauses, params = [], []
+    if upload_id is not None:
+        clauses.append('upload_id = ?')
+        params.append(upload_id)
+    if line_type is not None:
+        clauses.append('line_type = ?')
+        params.append(line_type)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+class AnalyticsStore:
+    """
+    Connection to the local analytics database (created on first use).
+    Usable as a context manager, which closes the connection.
+
+    upload_id=None in the query methods means every stored chat.
+    """
+
+    def __init__(self, path=config.DATABASE_PATH):
+        self.path = path
+        if str(path) != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def ingest(self, chatlines, filename):
+        """
+        Store a stream of parsed lines as a new upload and return its id.
+        The lines go through a single executemany in one transaction, so
+        a chat is either stored whole or not at all.
+        """
+        summary = _UploadSummary()
+        with self.connection:
+            upload_id = self.connection.execute(
+                'INSERT INTO chat_uploads (filename, total_messages, participant_count, participants) '
+                'VALUES (?, 0, 0, ?)', (filename, '[]')
+            ).lastrowid
+            self.connection.executemany(
+                'INSERT INTO chat_messages (upload_id, sender, message_body, timestamp, line_type) '
+                'VALUES (?, ?, ?, ?, ?)', _message_rows(upload_id, chatlines, summary)
+            )
+            participants = list(summary.participants)
+            self.connection.execute(
+                'UPDATE chat_uploads SET total_messages = ?, participant_count = ?, participants = ?, '
+                'date_start = ?, date_end = ? WHERE id = ?',
+                (summary.total_messages, len(participants), json.dumps(participants, ensure_ascii=False),
+                 summary.date_start, summary.date_end, upload_id)
+            )
+        return upload_id
+
+    def save_analytics(self, upload_id, analytics):
+        """Store analytics of an upload (keys of ANALYTICS_COLUMNS, stored as JSON)"""
+        values = [
+            json.dumps(analytics.get(column), ensure_ascii=False, default=json_default)
+            for column in ANALYTICS_COLUMNS
+        ]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO chat_analytics (upload_id, {', '.join(ANALYTICS_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(ANALYTICS_COLUMNS))})", [upload_id] + values
+            )
+
+    def delete_upload(self, upload_id):
+        """Remove an upload with its messages and analytics"""
+        with self.connection:
+            self.connection.execute('DELETE FROM chat_uploads WHERE id = ?', (upload_id,))
+
+    def uploads(self, limit=None):
+        """Stored uploads as dicts, most recent first"""
+        query = 'SELECT * FROM chat_uploads ORDER BY created_at DESC, id DESC'
+        params = ()
+        if limit is not None:
+            query += ' LIMIT ?'
+            params = (limit,)
+        cursor = self.connection.execute(query, params)
+        names = [column[0] for column in cursor.description]
+        uploads = [dict(zip(names, row)) for row in cursor]
+        for upload in uploads:
+            upload['participants'] = json.loads(upload['participants'])
+        return uploads
+
+    def analytics(self, upload_id):
+        """Latest stored analytics of an upload, None if there are none"""
+        row = self.connection.execute(
+            f"SELECT {', '.join(ANALYTICS_COLUMNS)} FROM chat_analytics "
+            'WHERE upload_id = ? ORDER BY id DESC LIMIT 1', (upload_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {column: json.loads(value) for column, value in zip(ANALYTICS_COLUMNS, row)}
+
+    def messages(self, upload_id, sender=None):
+        """Stream (sender, body, timestamp, line_type) of an upload in time order"""
+        query = ('SELECT sender, message_body, timestamp, line_type FROM chat_messages '
+                 'WHERE upload_id = ?')
+        params = [upload_id]
+        if sender is not None:
+            query += ' AND sender = ?'
+            params.append(sender)
+        yield from self.connection.execute(query + ' ORDER BY timestamp, id', params)
+
+    def counts_by_sender(self, upload_id=None, line_type='Chat'):
+        """[(sender, messages)] most active first; line_type=None counts every line"""
+        where, params = _upload_filter(upload_id, line_type)
+        where += (' AND' if where else ' WHERE') + ' sender IS NOT NULL'
+        return self.connection.execute(
+            f'SELECT sender, COUNT(*) AS n FROM chat_messages{where} '
+            'GROUP BY sender ORDER BY n DESC, sender', params
+        ).fetchall()
+
+    def counts_by_month(self, upload_id=None, line_type='Chat'):
+        """[('YYYY-MM', messages)] in month order; line_type=None counts every line"""
+        where, params = _upload_filter(upload_id, line_type)
+        where += (' AND' if where else ' WHERE') + ' timestamp IS NOT NULL'
+        return self.connection.execute(
+            f'SELECT substr(timestamp, 1, 7) AS month, COUNT(*) FROM chat_messages{where} '
+            'GROUP BY month ORDER BY month', params
+        ).fetchall()
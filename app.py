@@ -10,6 +10,7 @@ from datetime import datetime
 from collections import Counter
 import re
 import os
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables first (works for local development)
@@ -24,6 +25,8 @@ except Exception:
 from src.analyzers.chatline import Chatline
 from src.analyzers.reply_analyzer import ReplyAnalyzer
 from src.database.supabase_client import supabase_manager
+from sentiment_analyzer import SentimentAnalyzer
+from time_index import TimeIndex
 
 # Page configuration
 st.set_page_config(
@@ -88,20 +91,12 @@ st.sidebar.markdown("""
 3. Without Media
 """)
 
-# Main application logic
-if uploaded_file:
-    # Auto-save to Supabase (silently)
-    if supabase_manager.is_connected():
-        file_bytes = uploaded_file.getvalue()
-        supabase_manager.save_file(uploaded_file.name, file_bytes)
-    
-    # Parse chat file
-    content = uploaded_file.getvalue().decode('utf-8')
-    lines = content.split('\n')
-    
+@st.cache_resource(show_spinner=False)
+def parse_chat(content):
+    """Parse the chat once per upload and index its messages by time"""
     chats = []
     previous_chat = None
-    for line in lines:
+    for line in content.split('\n'):
         if line.strip():
             try:
                 chat = Chatline(line, previous_line=previous_chat)
@@ -110,8 +105,41 @@ if uploaded_file:
             except:
                 pass
     
-    # Filter chat messages
     msgs = [c for c in chats if c.line_type == "Chat"]
+    return msgs, TimeIndex.from_messages(msgs)
+
+@st.cache_resource(show_spinner="Scoring sentiment...")
+def score_sentiment(content):
+    """
+    Sentiment of every indexed message, once per upload, in time-index
+    order (so a date range is a slice), with a mask of the scorable ones
+    """
+    msgs, time_index = parse_chat(content)
+    indexed = [msgs[pos] for pos in time_index.positions.tolist()]
+    scorable = np.fromiter(
+        (bool(m.sender and m.body) for m in indexed), dtype=bool, count=len(indexed)
+    )
+    analyzer = SentimentAnalyzer()
+    return analyzer, analyzer.analyze_batch(indexed), scorable
+
+@st.cache_data(show_spinner="Bootstrapping confidence intervals...")
+def love_score_intervals(content, start_date, end_date):
+    """95% bootstrap intervals of the love scores, once per upload and date range"""
+    msgs, time_index = parse_chat(content)
+    msgs = time_index.select(msgs, time_index.locate(start_date, end_date))
+    scores = ReplyAnalyzer(msgs).get_love_scores(confidence=0.95)
+    return {s['sender']: s['love_score_interval'] for s in scores}
+
+# Main application logic
+if uploaded_file:
+    # Auto-save to Supabase (silently)
+    if supabase_manager.is_connected():
+        file_bytes = uploaded_file.getvalue()
+        supabase_manager.save_file(uploaded_file.name, file_bytes)
+    
+    # Parse chat file (cached across reruns)
+    content = uploaded_file.getvalue().decode('utf-8')
+    msgs, time_index = parse_chat(content)
     
     if len(msgs) == 0:
         st.error("❌ No messages found in the file!")
@@ -120,14 +148,14 @@ if uploaded_file:
     st.success(f"✅ Analyzed {len(msgs):,} messages successfully!")
     
     # Extract basic information
-    senders = [c.sender for c in msgs if c.sender]
-    sender_counts = Counter(senders)
-    dates = [c.timestamp for c in msgs if hasattr(c, 'timestamp') and c.timestamp]
+    sender_counts = Counter(time_index.sender_counts())
+    start_date = end_date = None
+    span = time_index.locate()
     
     # === DATE RANGE FILTER (SIDEBAR) ===
-    if dates:
-        min_date = min(dates).date()
-        max_date = max(dates).date()
+    if len(time_index):
+        min_date = time_index.first_date
+        max_date = time_index.last_date
         
         st.sidebar.markdown("---")
         st.sidebar.subheader("📅 Date Range Filter")
@@ -145,14 +173,18 @@ if uploaded_file:
             # Apply filter if range is selected
             if len(date_range) == 2:
                 start_date, end_date = date_range
-                msgs = [m for m in msgs if hasattr(m, 'timestamp') and m.timestamp and 
-                       start_date <= m.timestamp.date() <= end_date]
-                senders = [c.sender for c in msgs if c.sender]
-                sender_counts = Counter(senders)
-                dates = [c.timestamp for c in msgs if hasattr(c, 'timestamp') and c.timestamp]
+                span = time_index.locate(start_date, end_date)
+                msgs = time_index.select(msgs, span)
+                sender_counts = Counter(time_index.sender_counts(span))
                 
                 st.sidebar.success(f"Filtered: {len(msgs)} messages")
     
+    # Timestamps of the selected range, straight from the index
+    dates = time_index.times[span]
+    if len(dates):
+        first_seen = dates[0].item()
+        last_seen = dates[-1].item()
+    
     # === METRICS SECTION ===
     st.header("📊 Quick Overview")
     st.markdown("### Key Chat Statistics")
@@ -165,15 +197,15 @@ if uploaded_file:
         st.metric("👥 Participants", len(sender_counts))
     
     with col3:
-        if dates:
-            days = (max(dates) - min(dates)).days + 1
+        if len(dates):
+            days = (last_seen - first_seen).days + 1
             st.metric("📅 Duration (Days)", f"{days}")
         else:
             st.metric("📅 Duration", "N/A")
     
     with col4:
-        if dates and len(dates) > 0:
-            avg_per_day = len(msgs) / ((max(dates) - min(dates)).days + 1)
+        if len(dates):
+            avg_per_day = len(msgs) / ((last_seen - first_seen).days + 1)
             st.metric("📈 Avg Messages/Day", f"{avg_per_day:.1f}")
         else:
             st.metric("📈 Avg Messages/Day", "N/A")
@@ -277,11 +309,14 @@ if uploaded_file:
     # === TIME SERIES ANALYSIS ===
     st.header("📅 Activity Patterns Over Time")
     
-    if dates:
+    # Daily counts come from the index prefix sums
+    active_days, day_counts = time_index.daily_counts(start_date, end_date)
+    date_counts = dict(zip(active_days.astype(object).tolist(), day_counts.tolist()))
+    
+    if len(dates):
         # Daily activity
-        date_counts = Counter([d.date() for d in dates])
         dates_df = pd.DataFrame(
-            [(date, count) for date, count in sorted(date_counts.items())],
+            list(date_counts.items()),
             columns=['Date', 'Messages']
         )
         
@@ -296,9 +331,9 @@ if uploaded_file:
         st.plotly_chart(fig, width="stretch")
         
         # Hourly activity
-        hour_counts = Counter([d.hour for d in dates if hasattr(d, 'hour')])
+        hour_counts = time_index.hour_counts(span)
         hours_df = pd.DataFrame(
-            [(hour, hour_counts.get(hour, 0)) for hour in range(24)],
+            [(hour, int(hour_counts[hour])) for hour in range(24)],
             columns=['Hour', 'Messages']
         )
         
@@ -319,9 +354,9 @@ if uploaded_file:
         with col2:
             # Day of week activity
             day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            day_counts = Counter([d.weekday() for d in dates if hasattr(d, 'weekday')])
+            weekday_counts = time_index.weekday_counts(span)
             days_df = pd.DataFrame(
-                [(day_names[day], day_counts.get(day, 0)) for day in range(7)],
+                [(day_names[day], int(weekday_counts[day])) for day in range(7)],
                 columns=['Day', 'Messages']
             )
             
@@ -383,13 +418,19 @@ if uploaded_file:
             
             # Individual scores
             st.subheader("📊 Individual Engagement Scores")
+            # Bootstrapping is slow on long chats, so intervals are opt-in
+            intervals = {}
+            if st.checkbox("Show 95% confidence intervals", value=False, key="love_intervals"):
+                intervals = love_score_intervals(content, start_date, end_date)
             cols = st.columns(len(scores))
             for col, score_data in zip(cols, scores):
+                interval = intervals.get(score_data['sender'])
                 with col:
                     st.metric(
                         score_data['sender'][:15],
                         f"{score_data['love_score']:.1f}%",
-                        f"{score_data['message_count']} msgs"
+                        f"{score_data['message_count']} msgs",
+                        help=f"95% confidence interval: {interval[0]}–{interval[1]}%" if interval else None
                     )
             
             # Detailed chart
@@ -408,6 +449,36 @@ if uploaded_file:
                 fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
                 fig.update_layout(height=400, yaxis_title="Love Score (%)")
                 st.plotly_chart(fig, width="stretch")
+            
+            # Love score timeline
+            st.subheader("📈 Love Score Over Time")
+            names = [s['sender'] for s in scores]
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                replier = st.selectbox("Replies from", names, key="timeline_replier")
+            with col2:
+                replied_to = st.selectbox(
+                    "Replies to", [n for n in names if n != replier], key="timeline_replied_to"
+                )
+            with col3:
+                period = st.selectbox("Window", ["month", "week"], key="timeline_period")
+            
+            timeline = analyzer.love_score_timeline(replier, replied_to, period=period)
+            if timeline:
+                timeline_df = pd.DataFrame(timeline)
+                fig = px.line(
+                    timeline_df,
+                    x='start',
+                    y='love_score',
+                    title=f'{replier} → {replied_to}: Love Score per {period.title()}',
+                    markers=True,
+                    hover_data=['reply_count', 'median_reply_time', 'fast_reply_rate'],
+                    labels={'start': period.title(), 'love_score': 'Love Score (%)'}
+                )
+                fig.update_layout(height=400, yaxis_range=[0, 100])
+                st.plotly_chart(fig, width="stretch")
+            else:
+                st.info(f"{replier} has not replied to {replied_to} yet")
         else:
             st.info("Not enough data for love score analysis (need at least 2 participants)")
     
@@ -416,16 +487,58 @@ if uploaded_file:
     
     st.markdown("---")
     
+    # === SENTIMENT TRENDS ===
+    st.header("😊 Sentiment Trends")
+    
+    # Scored once per upload; the date filter only slices the cached scores
+    sentiment, all_scores, scorable = score_sentiment(content)
+    rows = span.start + np.flatnonzero(scorable[span])
+    sentiment_scores = all_scores.take(rows)
+    
+    if len(sentiment_scores):
+        period = st.selectbox("Group by", ["week", "month", "day"], key="sentiment_period")
+        trend = sentiment.aggregate_by_period(sentiment_scores, time_index.times[rows], period)
+        trend_df = pd.DataFrame(trend)
+        fig = px.line(
+            trend_df,
+            x='start',
+            y='mean_score',
+            title=f'Average Sentiment per {period.title()}',
+            hover_data=['count', 'positive', 'negative', 'neutral'],
+            labels={'start': period.title(), 'mean_score': 'Average Sentiment'}
+        )
+        fig.update_layout(height=400, yaxis_range=[-1, 1])
+        st.plotly_chart(fig, width="stretch")
+        
+        by_sender = sentiment.aggregate_by_sender(
+            sentiment_scores, time_index.codes[rows], time_index.senders
+        )
+        sender_df = pd.DataFrame([
+            {'Sender': name, 'Positive': stats['positive_ratio'] * 100,
+             'Negative': stats['negative_ratio'] * 100}
+            for name, stats in by_sender.items()
+        ])
+        fig = px.bar(
+            sender_df.head(10),
+            x='Sender',
+            y=['Positive', 'Negative'],
+            barmode='group',
+            title='Positive vs Negative Messages (%)',
+            color_discrete_sequence=['#239a3b', '#d73a49']
+        )
+        fig.update_layout(height=400, yaxis_title="Messages (%)")
+        st.plotly_chart(fig, width="stretch")
+    
+    st.markdown("---")
+    
     # === CALENDAR HEATMAP ===
     st.header("🗓️ Activity Calendar Heatmap")
     st.markdown("### GitHub-Style Contribution Calendar")
     
-    if dates:
+    if len(dates):
         import plotly.graph_objects as go
         import numpy as np
         
-        date_counts = Counter([d.date() for d in dates])
-        
         # Prepare data
         dates_list = sorted(date_counts.keys())
         if dates_list:
@@ -3,6 +3,21 @@ import re
 from dateutil import parser
 import emoji
 import patterns
+from memo import Memo
+
+
+def _words(string):
+    return tuple(re.sub(r"[^\w]", " ",  string).split())
+
+
+def _emojis(string):
+    return tuple(c["emoji"] for c in emoji.emoji_list(string))
+
+
+# Bodies repeat a lot; tokenize and scan each distinct body once
+words_memo = Memo(_words)
+emojis_memo = Memo(_emojis)
+
 
 class Chatline:
 
@@ -105,15 +120,10 @@ class Chatline:
         return domain[0]
 
     def get_words(self, string=""):
-        #remove non alpha content
-        regex = re.sub(r"[^a-z\s]+", "", string.lower())
-        regex = re.sub(r'[^\x00-\x7f]',r'', regex)
-        words = re.sub(r"[^\w]", " ",  string).split()
-
-        return words
+        return list(words_memo(string))
 
     def extract_emojis(self, string=""):
-        return [c["emoji"] for c in emoji.emoji_list(string)]
+        return list(emojis_memo(string))
 
     def is_event(self, body=""):
         """Detect wether the body of chat is event log.
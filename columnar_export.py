@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Columnar Export for WhatsApp Analyzer
+Writes parsed messages column by column in row groups: Parquet when
+pyarrow is installed, an uncompressed NumPy .npz otherwise. Senders
+and line types are dictionary-encoded and timestamps typed; .npz
+columns are memory-mapped back without copying.
+"""
+
+import os
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TYPES = ('Chat', 'Event', 'Attachment')  # Type codes 0..2; -1 for anything else
+
+_NPZ_COLUMNS = {
+    'sender_codes': np.int32,
+    'timestamps': 'datetime64[s]',
+    'type_codes': np.int8,
+    'word_counts': np.int32,
+    'emoji_counts': np.int32,
+    'body_offsets': np.int64,
+    'body_data': np.uint8,
+}
+
+
+def default_suffix():
+    """'.parquet' when pyarrow is available, '.npz' otherwise"""
+    return '.parquet' if pq is not None else '.npz'
+
+
+class ColumnarMessages:
+    """
+    Columns of an exported chat, one entry per message:
+    - sender_codes (int32, -1 = none) indexing into senders
+    - timestamps (datetime64[s], NaT = none)
+    - type_codes (int8, -1 = other) indexing into TYPES
+    - word_counts / emoji_counts (int32)
+    - bodies as UTF-8 bytes in body_data, message i spanning
+      body_offsets[i]:body_offsets[i + 1]
+    """
+
+    def __init__(self, senders, sender_codes, timestamps, type_codes,
+                 word_counts, emoji_counts, body_offsets, body_data):
+        self.senders = senders
+        self.sender_codes = sender_codes
+        self.timestamps = timestamps
+        self.type_codes = type_codes
+        self.word_counts = word_counts
+        self.emoji_counts = emoji_counts
+        self.body_offsets = body_offsets
+        self.body_data = body_data
+
+    def __len__(self):
+        return len(self.sender_codes)
+
+    def body(self, i):
+        return bytes(self.body_data[self.body_offsets[i]:self.body_offsets[i + 1]]).decode('utf-8')
+
+    def bodies(self):
+        data = self.body_data.tobytes()
+        offsets = self.body_offsets.tolist()
+        return [data[lo:hi].decode('utf-8') for lo, hi in zip(offsets[:-1], offsets[1:])]
+
+    def to_pandas(self):
+        import pandas as pd
+        return pd.DataFrame({
+            'sender': pd.Categorical.from_codes(self.sender_codes, list(self.senders)),
+            'timestamp': self.timestamps,
+            'type': pd.Categorical.from_codes(self.type_codes, list(TYPES)),
+            'body': self.bodies(),
+            'word_count': self.word_counts,
+            'emoji_count': self.emoji_counts,
+        })
+
+
+class _RowGroup:
+    """Rows buffered until the next flush"""
+
+    def __init__(self):
+        self.senders = []
+        self.timestamps = []
+        self.types = []
+        self.bodies = []
+        self.word_counts = []
+        self.emoji_counts = []
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def add(self, chatline):
+        self.senders.append(chatline.sender)
+        self.timestamps.append(chatline.timestamp)
+        self.types.append(chatline.line_type)
+        self.bodies.append(chatline.body or '')
+        self.word_counts.append(len(chatline.words))
+        self.emoji_counts.append(len(chatline.emojis))
+
+
+class _ParquetSink:
+    """Writes row groups to a temporary file renamed over the output on close"""
+
+    def __init__(self, path):
+        self.path = path
+        self.partial = f"{path}.partial"
+        self.schema = pa.schema([
+            ('sender', pa.string()),
+            ('timestamp', pa.timestamp('s')),
+            ('type', pa.string()),
+            ('body', pa.string()),
+            ('word_count', pa.int32()),
+            ('emoji_count', pa.int32()),
+        ])
+        self.writer = pq.ParquetWriter(
+            self.partial, self.schema, use_dictionary=['sender', 'type'], compression='snappy'
+        )
+
+    def write(self, group):
+        table = pa.Table.from_arrays([
+            pa.array(group.senders, pa.string()),
+            pa.array(group.timestamps, pa.timestamp('s')),
+            pa.array(group.types, pa.string()),
+            pa.array(group.bodies, pa.string()),
+            pa.array(group.word_counts, pa.int32()),
+            pa.array(group.emoji_counts, pa.int32()),
+        ], schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+        os.replace(self.partial, self.path)
+
+    def abort(self):
+        try:
+            self.writer.close()
+        finally:
+            if os.path.exists(self.partial):
+                os.remove(self.partial)
+
+
+class _NpzSink:
+    """
+    Appends each row group to per-column spill files, then packs them into
+    a stored .npz (written aside and renamed over the output when complete)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.partial = f"{path}.partial"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = {
+            name: open(os.path.join(self.tmp.name, name), 'wb') for name in _NPZ_COLUMNS
+        }
+        self.sender_index = {}
+        self.type_index = {name: code for code, name in enumerate(TYPES)}
+        self.rows = 0
+        self.body_bytes = 0
+        self.files['body_offsets'].write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def write(self, group):
+        index = self.sender_index
+        columns = {
+            'sender_codes': [index.setdefault(s, len(index)) if s else -1 for s in group.senders],
+            'timestamps': [t if t is not None else np.datetime64('NaT') for t in group.timestamps],
+            'type_codes': [self.type_index.get(t, -1) for t in group.types],
+            'word_counts': group.word_counts,
+            'emoji_counts': group.emoji_counts,
+        }
+        encoded = [body.encode('utf-8') for body in group.bodies]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        columns['body_offsets'] = self.body_bytes + np.cumsum(lengths)
+        self.body_bytes += int(lengths.sum())
+
+        for name, values in columns.items():
+            self.files[name].write(np.asarray(values, dtype=_NPZ_COLUMNS[name]).tobytes())
+        self.files['body_data'].write(b''.join(encoded))
+        self.rows += len(group)
+
+    def close(self):
+        shapes = {name: self.rows for name in _NPZ_COLUMNS}
+        shapes['body_offsets'] = self.rows + 1
+        shapes['body_data'] = self.body_bytes
+        with zipfile.ZipFile(self.partial, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, dtype in _NPZ_COLUMNS.items():
+                self.files[name].close()
+                header = {
+                    'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                    'fortran_order': False,
+                    'shape': (shapes[name],),
+                }
+                with archive.open(name + '.npy', 'w', force_zip64=True) as member, \
+                        open(os.path.join(self.tmp.name, name), 'rb') as spill:
+                    np.lib.format.write_array_header_2_0(member, header)
+                    while True:
+                        block = spill.read(1 << 20)
+                        if not block:
+                            break
+                        member.write(block)
+            senders = np.array(list(self.sender_index), dtype=str)
+            with archive.open('senders.npy', 'w', force_zip64=True) as member:
+                np.lib.format.write_array(member, senders, allow_pickle=False)
+        self.tmp.cleanup()
+        os.replace(self.partial, self.path)
+
+    def abort(self):
+        for file in self.files.values():
+            file.close()
+        self.tmp.cleanup()
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+
+def write_columnar(chatlines, output_path, row_group_size=config.COLUMNAR_ROW_GROUP_SIZE):
+    """
+    Stream parsed lines (lines without a type are skipped) into a
+    columnar file, row_group_size rows at a time. The format follows the
+    suffix: .parquet (needs pyarrow) or .npz. The output only appears once
+    complete; if writing fails, the buffers and partial file are discarded.
+    Returns the rows written.
+    """
+    if str(output_path).endswith('.parquet'):
+        if pq is None:
+            raise ImportError("Parquet export needs pyarrow; use a .npz path instead")
+        sink = _ParquetSink(output_path)
+    else:
+        sink = _NpzSink(output_path)
+
+    rows = 0
+    group = _RowGroup()
+    try:
+        for chatline in chatlines:
+            if chatline.line_type is None:
+                continue
+            group.add(chatline)
+            if len(group) >= row_group_size:
+                sink.write(group)
+                rows += len(group)
+                group = _RowGroup()
+        if len(group) or rows == 0:
+            sink.write(group)
+            rows += len(group)
+        sink.close()
+    except BaseException:
+        sink.abort()
+        raise
+    return rows
+
+
+def _mmap_member(path, info):
+    """Memory-map one stored .npy member of a zip archive"""
+    with open(path, 'rb') as file:
+        file.seek(info.header_offset)
+        local_header = file.read(30)
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    if shape[0] == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def read_parquet_table(path):
+    """Memory-mapped pyarrow Table of a .parquet export (sender and type dictionary-encoded)"""
+    if pq is None:
+        raise ImportError("Reading Parquet exports needs pyarrow")
+    return pq.read_table(str(path), memory_map=True, read_dictionary=['sender', 'type'])
+
+
+def read_npz_messages(path):
+    """ColumnarMessages of a .npz export, with memory-mapped columns"""
+    columns = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+            if name == 'senders' or info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    columns[name] = np.lib.format.read_array(member, allow_pickle=False)
+            else:
+                columns[name] = _mmap_member(path, info)
+    return ColumnarMessages(
+        columns['senders'].tolist(),
+        columns['sender_codes'], columns['timestamps'], columns['type_codes'],
+        columns['word_counts'], columns['emoji_counts'],
+        columns['body_offsets'], columns['body_data']
+    )
+
+
+def load_dataframe(path):
+    """pandas DataFrame of a columnar export (.parquet or .npz)"""
+    if str(path).endswith('.parquet'):
+        return read_parquet_table(path).to_pandas()
+    return read_npz_messages(path).to_pandas()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compressed Text I/O for WhatsApp Analyzer
+Opens export files as streaming text, compressed on the fly: gzip
+(built in) or zstd (Python 3.14+ or the zstandard package). The codec
+follows the file suffix or an explicit choice; readers also sniff the
+magic bytes, so a renamed file still opens.
+"""
+
+import gzip
+import io
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+CODECS = {'gzip': '.gz', 'zstd': '.zst'}  # Codec name -> file suffix
+MAGIC = {'gzip': b'\x1f\x8b', 'zstd': b'\x28\xb5\x2f\xfd'}
+
+
+def available_codecs():
+    """Codec names usable here; gzip always is"""
+    return [name for name in CODECS if name != 'zstd' or zstd is not None]
+
+
+def codec_for_path(path):
+    """Codec implied by the suffix of path, None for plain files"""
+    path = str(path)
+    for name, suffix in CODECS.items():
+        if path.endswith(suffix):
+            return name
+    return None
+
+
+def resolve_codec(path, compress=None):
+    """
+    Codec to write path with: compress names one ('gzip' or 'zstd'),
+    True means gzip, and None/False fall back to the suffix of path
+    """
+    if not compress:
+        codec = codec_for_path(path)
+    elif compress is True:
+        codec = 'gzip'
+    elif compress in CODECS:
+        codec = compress
+    else:
+        raise ValueError(f"Unknown compression: {compress} (choose from {', '.join(CODECS)})")
+    if codec == 'zstd' and zstd is None:
+        raise ImportError("zstd compression needs Python 3.14+ or the zstandard package")
+    return codec
+
+
+def output_suffix(compress):
+    """Suffix to append to a default file name for compress ('' when off)"""
+    if not compress:
+        return ''
+    return CODECS['gzip' if compress is True else compress]
+
+
+def _open(path, mode, codec, newline):
+    if codec == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline=newline)
+    if codec == 'zstd':
+        if zstd is None:
+            raise ImportError("zstd compression needs Python 3.14+ or the zstandard package")
+        return zstd.open(path, mode + 't', encoding='utf-8', newline=newline)
+    return io.open(path, mode, encoding='utf-8', newline=newline)
+
+
+def open_output(path, compress=None, newline=None):
+    """Text file to stream an export into, compressed as resolve_codec decides"""
+    return _open(path, 'w', resolve_codec(path, compress), newline)
+
+
+def sniff_codec(path):
+    """Codec of an existing file from its magic bytes, None for plain files"""
+    with io.open(path, 'rb') as file:
+        head = file.read(4)
+    for name, magic in MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_input(path, newline=None):
+    """Text file reading back an export, plain or compressed"""
+    return _open(path, 'r', sniff_codec(path), newline)
@@ -10,6 +10,8 @@ from pathlib import Path
 # Base directories
 BASE_DIR = Path(__file__).parent
 STOP_WORDS_DIR = BASE_DIR / "stop-words"
+SENTIMENT_WORDS_DIR = BASE_DIR / "sentiment-words"
+TEMPLATES_DIR = BASE_DIR / "templates"
 EXPORT_DIR = BASE_DIR / "exports"
 REPORTS_DIR = BASE_DIR / "reports"
 DATA_DIR = BASE_DIR / "data"
@@ -45,6 +47,7 @@ COLOR_SCHEMES = {
 
 # Export formats
 EXPORT_FORMATS = ['json', 'csv', 'html', 'pdf']
+COLUMNAR_ROW_GROUP_SIZE = 100000  # Messages per row group of columnar exports
 
 # Database settings
 DATABASE_ENABLED = False
@@ -58,13 +61,16 @@ WEB_DEBUG = True
 
 # Sentiment analysis settings
 SENTIMENT_ENABLED = True
-SENTIMENT_LANGUAGES = ['en', 'id']
+SENTIMENT_LANGUAGES = ['en', 'id']  # Packs in sentiment-words/, loaded on first use
 
 # Performance settings
 ENABLE_CACHING = True
 CACHE_SIZE = 1000
-PARALLEL_PROCESSING = True
+PARALLEL_PROCESSING = True  # False keeps sentiment scoring in-process, even with parallel=True
 MAX_WORKERS = 4
+SENTIMENT_PARALLEL_MIN_MESSAGES = 200000  # Smaller batches are scored in-process
+SENTIMENT_CHUNK_SIZE = 20000  # Messages per parallel sentiment task
+DENSE_INTERACTION_MAX_SENDERS = 2000  # Larger groups use a sparse interaction matrix
 
 # Privacy settings
 ANONYMIZE_NUMBERS = True
@@ -77,6 +83,8 @@ CONVERSATION_FLOW_ANALYSIS = True
 PEAK_HOURS_ANALYSIS = True
 DAILY_PATTERNS_ANALYSIS = True
 WEEKLY_PATTERNS_ANALYSIS = True
+CONVERSATION_GAP_MINUTES = 30  # Silence that ends a conversation
+SKETCH_RELATIVE_ACCURACY = 0.01  # Relative error of reply-time percentiles
 
 # Notification settings
 ENABLE_NOTIFICATIONS = False
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Export Pipeline for WhatsApp Analyzer
+Builds the statistics snapshot once and hands it to every registered
+exporter; exporters write concurrently in a thread pool
+"""
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import config
+
+
+def freeze(value):
+    """Read-only deep copy: dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def json_default(value):
+    """json.dump default handling frozen snapshots (and dates etc. as strings)"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+class ExportPipeline:
+    """
+    Registry of exporters, called as exporter(stats=snapshot, **options)
+    and returning the path they wrote. run() computes the snapshot once,
+    whatever the number of formats.
+    """
+
+    def __init__(self, max_workers=config.MAX_WORKERS):
+        self.max_workers = max_workers
+        self.exporters = {}
+
+    def register(self, name, exporter):
+        self.exporters[name] = exporter
+
+    @property
+    def formats(self):
+        return list(self.exporters)
+
+    def run(self, get_statistics, formats=None, **options):
+        """
+        Snapshot get_statistics() once and run the exporters of `formats`
+        (all registered ones by default) with the same keyword options;
+        returns {format: path} in order
+        """
+        formats = self.formats if formats is None else list(formats)
+        unknown = [name for name in formats if name not in self.exporters]
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+
+        snapshot = freeze(get_statistics())
+        workers = max(1, min(self.max_workers, len(formats)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.exporters[name], stats=snapshot, **options) for name in formats
+            ]
+            return {name: future.result() for name, future in zip(formats, futures)}
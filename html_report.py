@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+HTML Report Renderer for WhatsApp Analyzer
+Compiles templates/report.html once per process into literal chunks and
+placeholders, then streams the report straight to the output file;
+chart rows travel as one compact JSON blob drawn in the browser
+"""
+
+import html
+import io
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+
+import config
+from compressed_io import open_output
+
+REPORT_TEMPLATE = config.TEMPLATES_DIR / "report.html"
+PLACEHOLDER = re.compile(r'{{\s*(\w+)\s*}}')
+CHART_SECTIONS = ('senders', 'words', 'emojis', 'domains')
+CHART_ROWS = 15  # Bars per chart
+
+
+@lru_cache(maxsize=None)
+def compile_template(path=str(REPORT_TEMPLATE)):
+    """Template as a tuple of (literal text, placeholder name or None) chunks"""
+    with io.open(path, "r", encoding="utf-8") as file:
+        source = file.read()
+    chunks = []
+    position = 0
+    for match in PLACEHOLDER.finditer(source):
+        chunks.append((source[position:match.start()], match.group(1)))
+        position = match.end()
+    chunks.append((source[position:], None))
+    return tuple(chunks)
+
+
+def render(chunks, values, file):
+    """Write the compiled template to an open text file, chunk by chunk"""
+    for literal, name in chunks:
+        file.write(literal)
+        if name is not None:
+            file.write(values[name])
+
+
+def chart_json(stats, rows=CHART_ROWS):
+    """Compact JSON of the top [label, count] pairs of every chart, safe inside <script>"""
+    data = {
+        section: [[str(label), count] for label, count in stats[section][:rows]]
+        for section in CHART_SECTIONS
+    }
+    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return text.replace('<', '\\u003c')
+
+
+def write_report(stats, output_path, template=str(REPORT_TEMPLATE), compress=None):
+    """
+    Stream the HTML report of a statistics snapshot to output_path
+    (compressed as compressed_io.open_output decides)
+    """
+    overview = stats['overview']
+    values = {
+        'total_chats': html.escape(str(overview['total_chats'])),
+        'unique_senders': html.escape(str(overview['unique_senders'])),
+        'unique_words': html.escape(str(overview['unique_words'])),
+        'unique_emojis': html.escape(str(overview['unique_emojis'])),
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'chart_data': chart_json(stats),
+    }
+    with open_output(output_path, compress) as file:
+        render(compile_template(template), values, file)
+    return output_path
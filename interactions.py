@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sender Interaction Matrix for WhatsApp Analyzer
+Counts "who replied to whom" over integer sender codes with NumPy
+"""
+
+import numpy as np
+
+import config
+
+
+class InteractionMatrix:
+    """
+    Reply transitions between senders.
+    Entry [i, j] counts how often sender j wrote right after sender i.
+
+    Small groups are stored as a dense (P, P) array; groups with more than
+    config.DENSE_INTERACTION_MAX_SENDERS senders keep only the non-zero
+    entries as sorted (row, col, count) arrays.
+    """
+
+    def __init__(self, senders, dense=None, rows=None, cols=None, counts=None):
+        self.senders = senders
+        self.dense = dense
+        self.rows = rows
+        self.cols = cols
+        self.counts = counts
+        self._sender_index = {name: code for code, name in enumerate(senders)}
+
+    @classmethod
+    def from_arrays(cls, arrays, max_dense_senders=config.DENSE_INTERACTION_MAX_SENDERS):
+        """Build from MessageArrays in a single vectorized pass"""
+        size = arrays.sender_count
+        prev = arrays.codes[:-1]
+        curr = arrays.codes[1:]
+        changed = prev != curr
+        prev = prev[changed]
+        curr = curr[changed]
+
+        if size <= max_dense_senders:
+            dense = np.zeros((size, size), dtype=np.int64)
+            np.add.at(dense, (prev, curr), 1)
+            return cls(arrays.senders, dense=dense)
+
+        keys, counts = np.unique(
+            prev.astype(np.int64) * size + curr, return_counts=True
+        )
+        return cls(arrays.senders, rows=keys // size, cols=keys % size, counts=counts)
+
+    @property
+    def is_sparse(self):
+        return self.dense is None
+
+    def __len__(self):
+        return len(self.senders)
+
+    def _row(self, code):
+        """(replier codes, counts) of everyone who wrote right after `code`"""
+        if not self.is_sparse:
+            row = self.dense[code]
+            cols = np.flatnonzero(row)
+            return cols, row[cols]
+        lo, hi = np.searchsorted(self.rows, [code, code + 1])
+        return self.cols[lo:hi], self.counts[lo:hi]
+
+    def _col(self, code):
+        """(replied-to codes, counts) of everyone `code` wrote right after"""
+        if not self.is_sparse:
+            col = self.dense[:, code]
+            rows = np.flatnonzero(col)
+            return rows, col[rows]
+        mask = self.cols == code
+        return self.rows[mask], self.counts[mask]
+
+    def count(self, replied_to, replier):
+        """How often `replier` wrote right after `replied_to`"""
+        i = self._sender_index.get(replied_to)
+        j = self._sender_index.get(replier)
+        if i is None or j is None:
+            return 0
+        cols, counts = self._row(i)
+        hit = counts[cols == j]
+        return int(hit[0]) if len(hit) else 0
+
+    def top_reply_partners(self, name, top_n=5):
+        """Senders exchanging the most replies with `name`, in both directions"""
+        code = self._sender_index.get(name)
+        if code is None:
+            return []
+        totals = np.zeros(len(self.senders), dtype=np.int64)
+        for codes, counts in (self._row(code), self._col(code)):
+            np.add.at(totals, codes, counts)
+        partners = np.flatnonzero(totals)
+        order = partners[np.argsort(-totals[partners], kind='stable')][:top_n]
+        return [(self.senders[c], int(totals[c])) for c in order]
+
+    def reply_probabilities(self, name):
+        """P(next sender | previous sender is `name`), as {sender: probability}"""
+        code = self._sender_index.get(name)
+        if code is None:
+            return {}
+        cols, counts = self._row(code)
+        total = counts.sum()
+        if total == 0:
+            return {}
+        return {self.senders[c]: float(p) for c, p in zip(cols, counts / total)}
+
+    def transition_matrix(self):
+        """Row-normalized dense transition matrix (rows with no replies stay 0)"""
+        size = len(self.senders)
+        if self.is_sparse:
+            dense = np.zeros((size, size), dtype=np.float64)
+            dense[self.rows, self.cols] = self.counts
+        else:
+            dense = self.dense.astype(np.float64)
+        totals = dense.sum(axis=1, keepdims=True)
+        np.divide(dense, totals, out=dense, where=totals > 0)
+        return dense
+
+    def to_dict(self):
+        """Nested {replied_to: {replier: count}} dict for JSON export"""
+        if self.is_sparse:
+            rows, cols, counts = self.rows, self.cols, self.counts
+        else:
+            rows, cols = np.nonzero(self.dense)
+            counts = self.dense[rows, cols]
+        result = {}
+        for i, j, n in zip(rows.tolist(), cols.tolist(), counts.tolist()):
+            result.setdefault(self.senders[i], {})[self.senders[j]] = n
+        return result
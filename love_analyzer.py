@@ -111,6 +111,10 @@ def main():
     parser.add_argument('-c', '--counterpart', help='Counterpart person name')
     parser.add_argument('--all-pairs', action='store_true', help='Analyze all participant pairs')
     parser.add_argument('--top', type=int, default=5, help='Number of top pairs to show (default: 5)')
+    parser.add_argument('--min-replies', type=int, default=1,
+                        help='Minimum reply events for a pair to be ranked (default: 1)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Score pairs in a process pool (large groups)')
     parser.add_argument('-e', '--export', help='Export results to JSON file')
     
     args = parser.parse_args()
@@ -177,14 +181,14 @@ def main():
             messages.append(chatline)
         previous_line = chatline
     
-    reply_analyzer = ReplyAnalyzer(messages)
+    reply_analyzer = ReplyAnalyzer(messages, parallel=args.parallel)
     
     # All pairs analysis
     if args.all_pairs:
         print(Color.bold(f"🔍 Analyzing all participant pairs..."))
         print("="*80 + "\n")
         
-        best_pairs = reply_analyzer.find_best_pairs(top_n=args.top)
+        best_pairs = reply_analyzer.find_best_pairs(top_n=args.top, min_replies=args.min_replies)
         
         if not best_pairs:
             print("❌ Insufficient data for pair analysis")
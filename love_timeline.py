@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Love Score Timeline for WhatsApp Analyzer
+Scores a reply series over tumbling or sliding calendar windows in one
+pass: prefix sums give the regression and mean terms of any window in
+O(1), and prefix-summed bucket histograms give its median
+"""
+
+import numpy as np
+
+from quantile_sketch import ReplyTimeSketch
+from reply_scoring import FAST_REPLY_MINUTES, love_score_terms
+from time_index import period_ids
+
+
+def love_score_timeline(minutes, times, period='month', window=1, step=1):
+    """
+    Love score of one reply series per window.
+
+    minutes/times: reply times and reply timestamps (datetime64), in chat order
+    period: 'day', 'week', 'month' or a number of days
+    window: periods per window; step: periods between window starts
+    (window == step gives tumbling windows, step < window sliding ones)
+
+    Returns a list of dicts with the window bounds and its metrics.
+    """
+    minutes = np.asarray(minutes, dtype=np.float64)
+    times = np.asarray(times)
+    if len(minutes) == 0:
+        return []
+
+    ids, period_start = period_ids(times, period)
+    first = ids[0]
+    n_periods = int(ids[-1] - first) + 1
+    offsets = np.searchsorted(ids, first + np.arange(n_periods + 1))
+
+    # Event ranges of every window
+    window_starts = np.arange(0, max(n_periods - window, 0) + 1, step)
+    lo = offsets[window_starts]
+    hi = offsets[np.minimum(window_starts + window, n_periods)]
+
+    # Prefix sums; the global reply number is position + 1
+    position = np.arange(1, len(minutes) + 1, dtype=np.float64)
+    zero = np.zeros(1)
+    cs_y = np.concatenate((zero, np.cumsum(minutes)))
+    cs_yy = np.concatenate((zero, np.cumsum(minutes * minutes)))
+    cs_iy = np.concatenate((zero, np.cumsum(position * minutes)))
+    cs_fast = np.concatenate((zero, np.cumsum(minutes <= FAST_REPLY_MINUTES)))
+
+    n = (hi - lo).astype(np.float64)
+    safe_n = np.maximum(n, 1)
+    sum_y = cs_y[hi] - cs_y[lo]
+    sum_yy = cs_yy[hi] - cs_yy[lo]
+    # Replies are renumbered 1..n inside each window
+    sum_xy = (cs_iy[hi] - cs_iy[lo]) - lo * sum_y
+    sum_x = n * (n + 1) / 2
+    sum_xx = n * (n + 1) * (2 * n + 1) / 6
+
+    num = n * sum_xy - sum_x * sum_y
+    den = n * sum_xx - sum_x * sum_x
+    slope = np.divide(num, den, out=np.zeros(len(n)), where=(den != 0) & (n >= 2))
+    mean = sum_y / safe_n
+    variance = np.divide(sum_yy - sum_y * mean, n - 1, out=np.zeros(len(n)), where=n > 1)
+    std = np.sqrt(np.maximum(variance, 0))
+    fast_rate = (cs_fast[hi] - cs_fast[lo]) / safe_n
+
+    # Windowed medians from prefix-summed histograms over the used buckets
+    sketch = ReplyTimeSketch()
+    used, columns = np.unique(sketch.bucket_keys(minutes), return_inverse=True)
+    values = np.array([sketch.bucket_value(k) for k in used.tolist()])
+    histogram = np.zeros((n_periods + 1, len(used)), dtype=np.int64)
+    np.add.at(histogram, (ids - first + 1, columns), 1)
+    np.cumsum(histogram, axis=0, out=histogram)
+
+    median = np.zeros(len(n))
+    for w, (start, count) in enumerate(zip(window_starts.tolist(), n.astype(np.int64).tolist())):
+        if count == 0:
+            continue
+        end = min(start + window, n_periods)
+        cumulative = np.cumsum(histogram[end] - histogram[start])
+        rank = 0.5 * (count - 1)
+        low = values[np.searchsorted(cumulative, np.floor(rank), 'right')]
+        high = values[np.searchsorted(cumulative, np.ceil(rank), 'right')]
+        median[w] = (low + high) / 2
+
+    _, _, _, score = love_score_terms(slope, median, fast_rate, std)
+    score = np.where(n > 0, score, 0)
+
+    timeline = []
+    for w, start in enumerate(window_starts.tolist()):
+        end = min(start + window, n_periods)
+        timeline.append({
+            'start': period_start(first + start).astype(object),
+            'end': (period_start(first + end) - np.timedelta64(1, 'D')).astype(object),
+            'reply_count': int(n[w]),
+            'median_reply_time': round(float(median[w]), 2),
+            'mean_reply_time': round(float(mean[w]), 2),
+            'fast_reply_rate': round(float(fast_rate[w]) * 100, 1),
+            'trend_slope': round(float(slope[w]), 4),
+            'love_score': int(round(float(score[w])))
+        })
+    return timeline
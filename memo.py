@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Message Body Memo for WhatsApp Analyzer
+Bounded LRU cache for per-body work (sentiment, tokenization, emoji
+extraction); chat bodies repeat constantly ("ok", "haha", "thanks"),
+so each distinct body only has to be processed once
+"""
+
+import threading
+from collections import OrderedDict
+
+import config
+
+
+def normalize_body(text):
+    """Lowercased body with whitespace collapsed"""
+    return ' '.join(text.lower().split())
+
+
+class Memo:
+    """
+    LRU memo of a one-argument function of a message body.
+
+    func: the function to cache; it is called with the normalized body
+    normalize: key function applied to the body first (None keeps it as is)
+    maxsize: number of bodies kept (config.CACHE_SIZE); caching is off
+    when config.ENABLE_CACHING is False or maxsize is 0
+
+    Cached values are shared between calls, so func should return
+    immutable values (tuples, numbers, strings). Memos are shared by every
+    parsing thread (Streamlit sessions, export threads); a lock guards the
+    cache and counters, while func itself runs outside it.
+    """
+
+    def __init__(self, func, normalize=None, maxsize=None):
+        self.func = func
+        self.normalize = normalize
+        if maxsize is None:
+            maxsize = config.CACHE_SIZE if config.ENABLE_CACHING else 0
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        key = self.normalize(text) if self.normalize else text
+        cache = self._cache
+        with self._lock:
+            if key in cache:
+                self.hits += 1
+                cache.move_to_end(key)
+                return cache[key]
+            self.misses += 1
+
+        # Computed outside the lock; two threads may both compute a new key
+        value = self.func(key)
+        if self.maxsize > 0:
+            with self._lock:
+                cache[key] = value
+                cache.move_to_end(key)
+                if len(cache) > self.maxsize:
+                    cache.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def hit_rate(self):
+        """Share of calls answered from the cache"""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._cache),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hit_rate
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Columnar Message Arrays for WhatsApp Analyzer
+Keeps parsed messages as NumPy columns (timestamps + integer sender codes)
+so that analyses can work on offsets instead of Chatline objects
+"""
+
+import numpy as np
+
+
+class MessageArrays:
+    """
+    Column view of a chat, in message order:
+    - times: datetime64[s] array
+    - codes: int32 sender codes, indexing into `senders`
+    - senders: list of sender names
+    """
+
+    def __init__(self, times, codes, senders):
+        self.times = times
+        self.codes = codes
+        self.senders = senders
+        self._sender_index = {name: code for code, name in enumerate(senders)}
+
+    @classmethod
+    def from_columns(cls, timestamps, senders):
+        """Build from parallel lists of datetimes and sender names"""
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(s, len(index)) for s in senders),
+            dtype=np.int32, count=len(senders)
+        )
+        times = np.array(timestamps, dtype='datetime64[s]')
+        return cls(times, codes, list(index))
+
+    @classmethod
+    def from_messages(cls, messages):
+        """Build from Chatline-like objects; lines without sender or timestamp are skipped"""
+        timestamps = []
+        senders = []
+        for m in messages:
+            sender = getattr(m, 'sender', None)
+            timestamp = getattr(m, 'timestamp', None)
+            if sender and timestamp:
+                timestamps.append(timestamp)
+                senders.append(sender)
+        return cls.from_columns(timestamps, senders)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def sender_count(self):
+        return len(self.senders)
+
+    def sender_code(self, name):
+        """Integer code of a sender name, or None if unknown"""
+        return self._sender_index.get(name)
+
+    def minutes(self):
+        """Timestamps as float64 minutes since the epoch"""
+        return self.times.astype(np.int64) / 60.0
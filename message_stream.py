@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Message Streaming for WhatsApp Analyzer
+Parses a chat export lazily, one Chatline at a time, and streams
+message-level records to newline-delimited JSON (optionally gzip or
+zstd compressed) in constant memory
+"""
+
+import io
+import json
+
+from chatline import Chatline
+from compressed_io import open_input, open_output
+
+
+def iter_chatlines(lines, debug=False):
+    """
+    Chatline objects of an iterable of raw lines, parsed lazily.
+    Each line only keeps its direct predecessor (needed for multi-line
+    messages), so the parsed history does not pile up in memory.
+    """
+    previous = None
+    for line in lines:
+        chatline = Chatline(line=line, previous_line=previous, debug=debug)
+        if previous is not None:
+            previous.previous_line = None
+        yield chatline
+        previous = chatline
+
+
+def read_chatlines(path, debug=False):
+    """Stream the Chatline objects of a chat export file"""
+    with io.open(path, "r", encoding="utf-8") as file:
+        yield from iter_chatlines(file, debug)
+
+
+def message_record(chatline):
+    """JSON-ready dict of one parsed line"""
+    return {
+        'sender': chatline.sender,
+        'timestamp': chatline.timestamp.isoformat() if chatline.timestamp else None,
+        'type': chatline.line_type,
+        'body': chatline.body,
+        'word_count': len(chatline.words),
+        'emoji_count': len(chatline.emojis)
+    }
+
+
+def write_ndjson(chatlines, output_path, compress=None):
+    """
+    Write one JSON record per parsed message (lines without a type are
+    skipped); compress is 'gzip', 'zstd' or True (gzip), otherwise the
+    .gz/.zst suffix of the path decides. Returns the number of records written.
+    """
+    count = 0
+    with open_output(output_path, compress) as file:
+        for chatline in chatlines:
+            if chatline.line_type is None:
+                continue
+            file.write(json.dumps(message_record(chatline), ensure_ascii=False))
+            file.write('\n')
+            count += 1
+    return count
+
+
+def read_ndjson(path):
+    """Stream the records of an NDJSON export (plain, gzip or zstd)"""
+    with open_input(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Parallel Pair Scoring for WhatsApp Analyzer
+Scores the reply buckets of very large groups in a process pool; the
+reply-time and offset arrays are placed in shared memory once and every
+worker scores a contiguous slice of pairs straight from it
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import config
+from reply_scoring import SeriesScores, score_segments
+
+
+def _share(array):
+    """Copy an array into a new shared memory block; returns (block, descriptor)"""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor):
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _score_slice(values_descriptor, offsets_descriptor, first, last):
+    """Worker: score pairs first..last-1 from the shared arrays"""
+    values_block, values = _attach(values_descriptor)
+    offsets_block, offsets = _attach(offsets_descriptor)
+    try:
+        lo, hi = offsets[first], offsets[last]
+        scores = score_segments(values[lo:hi], offsets[first:last + 1] - lo)
+        return {field: getattr(scores, field) for field in SeriesScores.FIELDS}
+    finally:
+        del values, offsets
+        values_block.close()
+        offsets_block.close()
+
+
+def _slice_bounds(offsets, parts):
+    """Split the pairs into `parts` contiguous slices holding similar numbers of events"""
+    targets = np.linspace(0, offsets[-1], parts + 1)[1:-1]
+    cuts = np.searchsorted(offsets, targets)
+    bounds = np.unique(np.concatenate(([0], cuts, [len(offsets) - 1])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def score_segments_parallel(values, offsets, max_workers=config.MAX_WORKERS):
+    """
+    Same result as reply_scoring.score_segments, computed by up to
+    max_workers processes. Falls back to a single process when there is
+    nothing to split.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    slices = _slice_bounds(offsets, max_workers) if len(offsets) > 2 else []
+    if max_workers <= 1 or len(slices) <= 1:
+        return score_segments(values, offsets)
+
+    values_block, values_descriptor = _share(values)
+    offsets_block, offsets_descriptor = _share(offsets)
+    try:
+        with ProcessPoolExecutor(max_workers=len(slices)) as pool:
+            futures = [
+                pool.submit(_score_slice, values_descriptor, offsets_descriptor, first, last)
+                for first, last in slices
+            ]
+            parts = [future.result() for future in futures]
+    finally:
+        for block in (values_block, offsets_block):
+            block.close()
+            block.unlink()
+
+    return SeriesScores(**{
+        field: np.concatenate([part[field] for part in parts])
+        for field in SeriesScores.FIELDS
+    })
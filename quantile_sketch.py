@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Reply Time Quantile Sketch for WhatsApp Analyzer
+Log-bucketed histogram giving medians and percentiles of reply times
+with bounded memory and a fixed relative error; sketches merge across
+chunks, pairs and files
+"""
+
+import math
+
+import numpy as np
+
+import config
+
+MIN_VALUE = 1 / 60                  # One second, in minutes
+MAX_VALUE = 60 * 24 * 365 * 20      # Twenty years, in minutes
+
+
+class ReplyTimeSketch:
+    """
+    Histogram of reply times (minutes) over logarithmic buckets.
+    Bucket i holds values in (gamma^(i-1), gamma^i], so every quantile is
+    answered within `relative_accuracy` of the true value. Values below
+    min_value (instant replies) are counted separately and reported as 0.
+    Only non-empty buckets are stored ({bucket: count}), so a sketch of a
+    handful of replies stays a handful of entries; queries work on the
+    sorted non-empty buckets.
+    """
+
+    def __init__(self, relative_accuracy=config.SKETCH_RELATIVE_ACCURACY,
+                 min_value=MIN_VALUE, max_value=MAX_VALUE):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = self._raw_key(min_value)
+        self.max_key = self._raw_key(max_value) - self._offset
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _raw_key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value):
+        """Add one reply time"""
+        self.count += 1
+        if value < self.min_value:
+            self.zero_count += 1
+            return
+        key = min(self._raw_key(value) - self._offset, self.max_key)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def add_many(self, values):
+        """Add an array of reply times"""
+        keys = self.bucket_keys(values)
+        small = keys < 0
+        used, counts = np.unique(keys[~small], return_counts=True)
+        buckets = self.buckets
+        for key, n in zip(used.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + n
+        self.zero_count += int(small.sum())
+        self.count += len(keys)
+
+    def _check_compatible(self, other):
+        if (self.relative_accuracy, self.min_value, self.max_value) != \
+                (other.relative_accuracy, other.min_value, other.max_value):
+            raise ValueError("Cannot merge sketches with different parameters")
+
+    def merge(self, other):
+        """Fold another sketch (e.g. from another chunk or file) into this one"""
+        self._check_compatible(other)
+        buckets = self.buckets
+        for key, n in other.buckets.items():
+            buckets[key] = buckets.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def bucket_keys(self, values):
+        """Bucket index of each value; instant replies (below min_value) map to -1"""
+        values = np.asarray(values, dtype=np.float64)
+        keys = np.full(len(values), -1, dtype=np.int64)
+        large = values >= self.min_value
+        keys[large] = np.ceil(np.log(values[large]) / self._log_gamma).astype(np.int64) - self._offset
+        return np.minimum(keys, self.max_key)
+
+    def bucket_value(self, key):
+        """Representative value of a bucket, within relative_accuracy of its members"""
+        if key < 0:
+            return 0.0
+        return 2 * self.gamma ** (key + self._offset) / (self.gamma + 1)
+
+    def _sorted_buckets(self):
+        """(keys, cumulative counts) of the non-empty buckets in key order"""
+        keys = np.fromiter(sorted(self.buckets), dtype=np.int64, count=len(self.buckets))
+        counts = np.fromiter((self.buckets[k] for k in keys.tolist()), dtype=np.int64, count=len(keys))
+        return keys, np.cumsum(counts)
+
+    def _value_at(self, keys, cumulative, rank):
+        """Approximate value of the rank-th smallest reply time (0-based)"""
+        if rank < self.zero_count:
+            return 0.0
+        i = int(np.searchsorted(cumulative, rank - self.zero_count, 'right'))
+        return self.bucket_value(int(keys[min(i, len(keys) - 1)]))
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile (0 <= q <= 1) of the reply times,
+        interpolating between neighbouring ranks like statistics.median
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        keys, cumulative = self._sorted_buckets()
+        low = self._value_at(keys, cumulative, lower)
+        if rank == lower:
+            return low
+        high = self._value_at(keys, cumulative, lower + 1)
+        return low + (rank - lower) * (high - low)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def percentiles(self, percentiles=(50, 90, 99)):
+        """{'p50': ..., 'p90': ..., 'p99': ...} in minutes"""
+        return {f'p{p}': self.quantile(p / 100) for p in percentiles}
+
+    def fraction_within(self, minutes):
+        """Approximate share of replies sent within `minutes`"""
+        if self.count == 0:
+            return 0.0
+        if minutes < self.min_value:
+            return self.zero_count / self.count
+        limit = min(self._raw_key(minutes) - self._offset, self.max_key)
+        within = sum(n for key, n in self.buckets.items() if key <= limit)
+        return (self.zero_count + within) / self.count
+
+    def to_dict(self):
+        """JSON-friendly form, storing only non-empty buckets"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'zero_count': self.zero_count,
+            'buckets': {key: self.buckets[key] for key in sorted(self.buckets)}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['min_value'], data['max_value'])
+        sketch.buckets = {int(key): n for key, n in data['buckets'].items() if n}
+        sketch.zero_count = data['zero_count']
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
@@ -6,18 +6,56 @@ Analyzes reply times, conversation patterns, and relationship dynamics
 Inspired by WhatsApp Reply Analyzer
 """
 
-import statistics
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import List, Dict, Tuple, Optional
 import math
 
+import numpy as np
+
+import config
+from love_timeline import love_score_timeline
+from parallel_scoring import score_segments_parallel
+from quantile_sketch import ReplyTimeSketch
+from reply_events import ReplyEvents
+from reply_graph import ReplyGraph
+from reply_scoring import (
+    FAST_REPLY_MINUTES, SeriesScores, love_score_terms, score_interval, score_segments,
+    score_series
+)
+
 class ReplyPoint:
     """Represents a single reply data point"""
     def __init__(self, index: int, reply_time_minutes: float):
         self.x = index  # Reply number for this person
         self.y = reply_time_minutes  # Time to reply in minutes
 
+class ReplySeries:
+    """
+    Reply series of one participant, stored as a float64 array of reply
+    times (y); the reply number x is implicit (1..n). Iterating or
+    indexing yields ReplyPoint objects for compatibility.
+    """
+    __slots__ = ('y',)
+    
+    def __init__(self, reply_time_minutes):
+        self.y = np.asarray(reply_time_minutes, dtype=np.float64)
+    
+    @property
+    def x(self) -> np.ndarray:
+        return np.arange(1, len(self.y) + 1)
+    
+    def __len__(self):
+        return len(self.y)
+    
+    def __iter__(self):
+        for i, y in enumerate(self.y.tolist(), 1):
+            yield ReplyPoint(i, y)
+    
+    def __getitem__(self, i: int) -> ReplyPoint:
+        i = range(len(self.y))[i]
+        return ReplyPoint(i + 1, self.y[i].item())
+
 class RegressionResult:
     """Linear regression results"""
     def __init__(self, slope: float, intercept: float, r: float, r2: float):
@@ -42,6 +80,74 @@ class LoveScore:
         self.verdict = verdict
         self.breakdown = breakdown
 
+def make_love_score(count: int, trend: float, speed: float, fast_rate: float,
+                    consistency: float, score: float) -> LoveScore:
+    """Love score with verdict and breakdown from the scaled score components"""
+    if count == 0:
+        return LoveScore(0, "Insufficient data", {})
+
+    # Determine verdict
+    if score >= 75:
+        verdict = "Strong interest 💕"
+    elif score >= 55:
+        verdict = "Moderate interest 💗"
+    elif score >= 35:
+        verdict = "Low interest 💙"
+    else:
+        verdict = "Very low interest 💔"
+
+    breakdown = {
+        'trend_score': round(trend * 35, 1),
+        'speed_score': round(speed * 35, 1),
+        'fast_rate_score': round(fast_rate * 20, 1),
+        'consistency_score': round(consistency * 10, 1)
+    }
+
+    return LoveScore(round(score), verdict, breakdown)
+
+def build_pair_report(target: str, counterpart: str,
+                      target_regression: RegressionResult, counterpart_regression: RegressionResult,
+                      target_stats: ParticipantStats, counterpart_stats: ParticipantStats,
+                      love_score: LoveScore, counterpart_love_score: LoveScore) -> Dict:
+    """Detailed metrics dict of a participant pair, as returned by analyze_pair"""
+    combined_love_score = (love_score.score + counterpart_love_score.score) / 2
+
+    return {
+        'target': {
+            'name': target,
+            'reply_count': target_stats.count,
+            'median_reply_time': round(target_stats.median, 2),
+            'mean_reply_time': round(target_stats.mean, 2),
+            'std_dev': round(target_stats.std, 2),
+            'fast_reply_rate': round(target_stats.fast_rate * 100, 1),
+            'trend_slope': round(target_regression.slope, 4),
+            'trend_r2': round(target_regression.r2, 4),
+            'love_score': love_score.score,
+            'verdict': love_score.verdict,
+            'score_breakdown': love_score.breakdown
+        },
+        'counterpart': {
+            'name': counterpart,
+            'reply_count': counterpart_stats.count,
+            'median_reply_time': round(counterpart_stats.median, 2),
+            'mean_reply_time': round(counterpart_stats.mean, 2),
+            'std_dev': round(counterpart_stats.std, 2),
+            'fast_reply_rate': round(counterpart_stats.fast_rate * 100, 1),
+            'trend_slope': round(counterpart_regression.slope, 4),
+            'trend_r2': round(counterpart_regression.r2, 4),
+            'love_score': counterpart_love_score.score,
+            'verdict': counterpart_love_score.verdict,
+            'score_breakdown': counterpart_love_score.breakdown
+        },
+        'comparison': {
+            'faster_replier': target if target_stats.median < counterpart_stats.median else counterpart,
+            'more_consistent': target if target_stats.std < counterpart_stats.std else counterpart,
+            'improving_faster': target if target_regression.slope < counterpart_regression.slope else counterpart,
+            'median_diff': abs(round(target_stats.median - counterpart_stats.median, 2)),
+            'combined_love_score': combined_love_score
+        }
+    }
+
 class ReplyAnalyzer:
     """
     Analyzes reply patterns between two participants
@@ -50,94 +156,137 @@ class ReplyAnalyzer:
     - Median reply time
     - Fast reply rate (% of replies within 5 minutes)
     - Consistency (standard deviation)
+    
+    With parallel=True the pair scoring behind find_best_pairs runs in a
+    process pool of up to max_workers processes (for very large groups).
     """
     
-    def __init__(self, messages: List):
+    def __init__(self, messages: List, parallel: bool = False,
+                 max_workers: int = config.MAX_WORKERS):
         self.messages = messages
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self._events = None
+        self._graph = None
+    
+    @property
+    def events(self) -> ReplyEvents:
+        """Reply events of all pairs, extracted once in a single pass"""
+        if self._events is None:
+            self._events = ReplyEvents.from_messages(self.messages)
+        return self._events
+    
+    @property
+    def reply_graph(self) -> ReplyGraph:
+        """Sparse graph of the pairs that replied to each other, scored once"""
+        if self._graph is None:
+            self._graph = ReplyGraph.from_events(self.events, self.score_all_pairs())
+        return self._graph
         
-    def build_reply_series(self, target: str, counterpart: str) -> Tuple[List[ReplyPoint], List[ReplyPoint]]:
+    def build_reply_series(self, target: str, counterpart: str) -> Tuple[ReplySeries, ReplySeries]:
         """
         Build reply time series for both participants
-        Returns: (target_series, counterpart_series)
+        Returns: (target_series, counterpart_series), views on the event arrays
         """
-        target_series = []
-        counterpart_series = []
-        target_index = 0
-        counterpart_index = 0
-        
-        for i in range(1, len(self.messages)):
-            prev = self.messages[i - 1]
-            curr = self.messages[i]
-            
-            # Skip if same person sent consecutive messages
-            if not hasattr(prev, 'sender') or not hasattr(curr, 'sender'):
-                continue
-            if prev.sender == curr.sender:
-                continue
-            if not hasattr(prev, 'timestamp') or not hasattr(curr, 'timestamp'):
-                continue
-                
-            # Calculate reply time in minutes
-            time_diff = curr.timestamp - prev.timestamp
-            delta_minutes = time_diff.total_seconds() / 60
-            
-            # Track replies
-            if curr.sender == target and prev.sender == counterpart:
-                target_index += 1
-                target_series.append(ReplyPoint(target_index, delta_minutes))
-            elif curr.sender == counterpart and prev.sender == target:
-                counterpart_index += 1
-                counterpart_series.append(ReplyPoint(counterpart_index, delta_minutes))
+        target_series = ReplySeries(self.events.reply_minutes(target, counterpart))
+        counterpart_series = ReplySeries(self.events.reply_minutes(counterpart, target))
         
         return target_series, counterpart_series
     
-    def compute_regression(self, points: List[ReplyPoint]) -> RegressionResult:
-        """Compute linear regression on reply points"""
-        n = len(points)
+    def score_all_pairs(self) -> SeriesScores:
+        """
+        Score the reply series of every (replier, replied_to) bucket at once
+        Entry k of the result belongs to self.events.pair_keys[k]
+        """
+        if self.parallel:
+            return score_segments_parallel(
+                self.events.minutes, self.events.offsets, self.max_workers
+            )
+        return score_segments(self.events.minutes, self.events.offsets)
+    
+    def love_score_timeline(self, target: str, counterpart: str, period: str = 'month',
+                            window: int = 1, step: int = 1) -> List[Dict]:
+        """
+        Love score of `target` replying to `counterpart` per calendar window
+        (see love_timeline.love_score_timeline for the window options)
+        """
+        bucket = self.events.bucket(target, counterpart)
+        return love_score_timeline(
+            self.events.minutes[bucket], self.events.times[bucket], period, window, step
+        )
+    
+    def reply_time_sketch(self, replier: str, replied_to: Optional[str] = None) -> ReplyTimeSketch:
+        """Quantile sketch of a sender's reply times, towards one counterpart or everyone"""
+        events = self.events
+        sketch = ReplyTimeSketch()
+        if replied_to is not None:
+            sketch.add_many(events.reply_minutes(replier, replied_to))
+            return sketch
+        code = events.sender_code(replier)
+        repliers, _ = events.pair_codes()
+        for k in np.flatnonzero(repliers == code):
+            sketch.add_many(events.minutes[events.offsets[k]:events.offsets[k + 1]])
+        return sketch
+    
+    def reply_time_percentiles(self, replier: str, replied_to: Optional[str] = None,
+                               percentiles=(50, 90, 99)) -> Dict[str, float]:
+        """Reply time percentiles (minutes), e.g. {'p50': 1.2, 'p90': 4.0, 'p99': 35.1}"""
+        return self.reply_time_sketch(replier, replied_to).percentiles(percentiles)
+    
+    def _y_values(self, points) -> np.ndarray:
+        if isinstance(points, ReplySeries):
+            return points.y
+        return np.fromiter((p.y for p in points), dtype=np.float64, count=len(points))
+    
+    def _regression_at(self, scores: SeriesScores, i: int) -> RegressionResult:
+        row = scores.row(i)
+        return RegressionResult(row['slope'], row['intercept'], row['r'], row['r2'])
+    
+    def _stats_at(self, scores: SeriesScores, i: int) -> ParticipantStats:
+        row = scores.row(i)
+        return ParticipantStats(row['count'], row['median'], row['mean'], row['std'], row['fast_rate'])
+    
+    def compute_regression(self, points: ReplySeries) -> RegressionResult:
+        """
+        Compute linear regression on reply points
+        A ReplySeries (x = 1..n) goes through the vectorized kernel; other
+        point lists are fitted on their own x values
+        """
+        if isinstance(points, ReplySeries):
+            return self._regression_at(score_series(points.y), 0)
         
+        n = len(points)
+        y = self._y_values(points)
         if n < 2:
-            avg_y = statistics.mean([p.y for p in points]) if points else 0
-            return RegressionResult(slope=0, intercept=avg_y, r=0, r2=0)
-        
-        sum_x = sum(p.x for p in points)
-        sum_y = sum(p.y for p in points)
-        sum_xy = sum(p.x * p.y for p in points)
-        sum_xx = sum(p.x * p.x for p in points)
-        sum_yy = sum(p.y * p.y for p in points)
+            return RegressionResult(slope=0, intercept=float(y.mean()) if n else 0, r=0, r2=0)
         
-        # Calculate slope and intercept
-        num = n * sum_xy - sum_x * sum_y
-        den = n * sum_xx - sum_x * sum_x
-        slope = num / den if den != 0 else 0
-        intercept = sum_y / n - slope * (sum_x / n)
-        
-        # Calculate correlation coefficient
-        r_den = math.sqrt((n * sum_xx - sum_x * sum_x) * (n * sum_yy - sum_y * sum_y))
-        r = num / r_den if r_den != 0 else 0
-        r2 = r * r
-        
-        return RegressionResult(slope, intercept, r, r2)
+        x = np.fromiter((p.x for p in points), dtype=np.float64, count=n)
+        dx = x - x.mean()
+        dy = y - y.mean()
+        sxx = float(dx @ dx)
+        syy = float(dy @ dy)
+        sxy = float(dx @ dy)
+        slope = sxy / sxx if sxx != 0 else 0
+        intercept = float(y.mean()) - slope * float(x.mean())
+        r = sxy / math.sqrt(sxx * syy) if sxx * syy != 0 else 0
+        return RegressionResult(slope, intercept, r, r * r)
     
-    def compute_stats(self, points: List[ReplyPoint]) -> ParticipantStats:
+    def compute_stats(self, points: ReplySeries) -> ParticipantStats:
         """Compute statistics for reply times"""
-        y_values = [p.y for p in points]
-        count = len(y_values)
-        
-        if count == 0:
-            return ParticipantStats(0, 0, 0, 0, 0)
-        
-        median = statistics.median(y_values)
-        mean = statistics.mean(y_values)
-        std = statistics.stdev(y_values) if count > 1 else 0
-        fast_rate = len([v for v in y_values if v <= 5]) / count if count > 0 else 0
-        
-        return ParticipantStats(count, median, mean, std, fast_rate)
+        return self._stats_at(score_series(self._y_values(points)), 0)
     
     def clamp01(self, value: float) -> float:
         """Clamp value between 0 and 1"""
         return max(0, min(1, value))
     
-    def calculate_love_score(self, target_series: List[ReplyPoint], 
+    def _love_score_at(self, scores: SeriesScores, i: int) -> LoveScore:
+        row = scores.row(i)
+        return make_love_score(
+            row['count'], row['trend'], row['speed'], row['fast_rate'],
+            row['consistency'], row['score']
+        )
+    
+    def calculate_love_score(self, target_series: ReplySeries, 
                             target_regression: RegressionResult,
                             target_stats: ParticipantStats) -> LoveScore:
         """
@@ -149,138 +298,256 @@ class ReplyAnalyzer:
         - Fast reply rate (20%): Higher % of <5min replies is better
         - Consistency (10%): Lower std deviation is better
         """
-        if len(target_series) == 0:
-            return LoveScore(0, "Insufficient data", {})
-        
-        slope = target_regression.slope
-        # Negative slope is better (getting faster over time)
-        # Scale by 0.5 minutes per message
-        slope_scaled = self.clamp01(-slope / 0.5)
-        
-        # Median reply time - closer to 0 is better, cap at 120 minutes
-        median = target_stats.median
-        median_scaled = self.clamp01((120 - min(median, 120)) / 120)
-        
-        # Fast reply rate (already 0-1)
-        fast_rate = target_stats.fast_rate
-        
-        # Consistency - lower std deviation is better, cap at 60
-        std = target_stats.std
-        consistency = self.clamp01(1 - min(std, 60) / 60)
-        
-        # Weighted score
-        score = 100 * (
-            0.35 * slope_scaled +    # Trend weight
-            0.35 * median_scaled +   # Central tendency
-            0.20 * fast_rate +       # Fast replies share
-            0.10 * consistency       # Variability
+        trend, speed, consistency, score = love_score_terms(
+            target_regression.slope, target_stats.median,
+            target_stats.fast_rate, target_stats.std
+        )
+        return make_love_score(
+            len(target_series), trend.item(), speed.item(), target_stats.fast_rate,
+            consistency.item(), score.item()
         )
-        
-        # Determine verdict
-        if score >= 75:
-            verdict = "Strong interest 💕"
-        elif score >= 55:
-            verdict = "Moderate interest 💗"
-        elif score >= 35:
-            verdict = "Low interest 💙"
-        else:
-            verdict = "Very low interest 💔"
-        
-        breakdown = {
-            'trend_score': round(slope_scaled * 35, 1),
-            'speed_score': round(median_scaled * 35, 1),
-            'fast_rate_score': round(fast_rate * 20, 1),
-            'consistency_score': round(consistency * 10, 1)
-        }
-        
-        return LoveScore(round(score), verdict, breakdown)
     
-    def analyze_pair(self, target: str, counterpart: str) -> Dict:
+    def analyze_pair(self, target: str, counterpart: str,
+                     confidence: Optional[float] = None) -> Dict:
         """
         Complete analysis for a participant pair
         Returns detailed metrics and love score
+        With confidence (e.g. 0.95) each side also gets a bootstrap
+        'love_score_interval' of (low, high)
         """
-        # Build reply series
-        target_series, counterpart_series = self.build_reply_series(target, counterpart)
-        
-        # Compute regressions
-        target_regression = self.compute_regression(target_series)
-        counterpart_regression = self.compute_regression(counterpart_series)
+        # Reply series of both directions, scored together
+        target_minutes = self.events.reply_minutes(target, counterpart)
+        counterpart_minutes = self.events.reply_minutes(counterpart, target)
+        scores = score_segments(
+            np.concatenate([target_minutes, counterpart_minutes]),
+            [0, len(target_minutes), len(target_minutes) + len(counterpart_minutes)]
+        )
         
-        # Compute statistics
-        target_stats = self.compute_stats(target_series)
-        counterpart_stats = self.compute_stats(counterpart_series)
+        target_regression = self._regression_at(scores, 0)
+        counterpart_regression = self._regression_at(scores, 1)
+        target_stats = self._stats_at(scores, 0)
+        counterpart_stats = self._stats_at(scores, 1)
         
         # Calculate love score for target
-        love_score = self.calculate_love_score(target_series, target_regression, target_stats)
+        love_score = self._love_score_at(scores, 0)
         
         # Calculate love score for counterpart
-        counterpart_love_score = self.calculate_love_score(
-            counterpart_series, counterpart_regression, counterpart_stats
+        counterpart_love_score = self._love_score_at(scores, 1)
+        
+        report = build_pair_report(
+            target, counterpart,
+            target_regression, counterpart_regression,
+            target_stats, counterpart_stats,
+            love_score, counterpart_love_score
         )
         
-        combined_love_score = (love_score.score + counterpart_love_score.score) / 2
-
-        return {
-            'target': {
-                'name': target,
-                'reply_count': target_stats.count,
-                'median_reply_time': round(target_stats.median, 2),
-                'mean_reply_time': round(target_stats.mean, 2),
-                'std_dev': round(target_stats.std, 2),
-                'fast_reply_rate': round(target_stats.fast_rate * 100, 1),
-                'trend_slope': round(target_regression.slope, 4),
-                'trend_r2': round(target_regression.r2, 4),
-                'love_score': love_score.score,
-                'verdict': love_score.verdict,
-                'score_breakdown': love_score.breakdown
-            },
-            'counterpart': {
-                'name': counterpart,
-                'reply_count': counterpart_stats.count,
-                'median_reply_time': round(counterpart_stats.median, 2),
-                'mean_reply_time': round(counterpart_stats.mean, 2),
-                'std_dev': round(counterpart_stats.std, 2),
-                'fast_reply_rate': round(counterpart_stats.fast_rate * 100, 1),
-                'trend_slope': round(counterpart_regression.slope, 4),
-                'trend_r2': round(counterpart_regression.r2, 4),
-                'love_score': counterpart_love_score.score,
-                'verdict': counterpart_love_score.verdict,
-                'score_breakdown': counterpart_love_score.breakdown
-            },
-            'comparison': {
-                'faster_replier': target if target_stats.median < counterpart_stats.median else counterpart,
-                'more_consistent': target if target_stats.std < counterpart_stats.std else counterpart,
-                'improving_faster': target if target_regression.slope < counterpart_regression.slope else counterpart,
-                'median_diff': abs(round(target_stats.median - counterpart_stats.median, 2)),
-                'combined_love_score': combined_love_score
-            }
-        }
+        if confidence is not None:
+            report['target']['love_score_interval'] = score_interval(target_minutes, confidence)
+            report['counterpart']['love_score_interval'] = score_interval(
+                counterpart_minutes, confidence
+            )
+        return report
     
-    def find_best_pairs(self, top_n: int = 5) -> List[Tuple[str, str, float]]:
+    def find_best_pairs(self, top_n: int = 5, min_replies: int = 1) -> List[Tuple[str, str, float]]:
         """
         Find participant pairs with highest combined love scores
+        Only pairs with at least `min_replies` reply events are ranked
         Returns: List of (person1, person2, combined_score)
         """
-        # Get unique senders
-        senders = list(set([m.sender for m in self.messages if hasattr(m, 'sender') and m.sender]))
+        return self.reply_graph.top_pairs(top_n, min_replies)
+    
+    def get_love_scores(self, confidence: Optional[float] = None) -> List[Dict]:
+        """
+        Calculate love scores for all participants
+        Returns: List of dicts with sender, love_score, rank
+        (and love_score_interval when a confidence level is given)
+        """
+        from collections import Counter
+        
+        # Get all senders
+        senders = [m.sender for m in self.messages if hasattr(m, 'sender') and m.sender]
+        sender_counts = Counter(senders)
+        unique_senders = list(sender_counts.keys())
         
-        if len(senders) < 2:
+        if len(unique_senders) < 2:
             return []
         
-        pairs = []
-        for i in range(len(senders)):
-            for j in range(i + 1, len(senders)):
-                try:
-                    analysis = self.analyze_pair(senders[i], senders[j])
-                    combined_score = (
-                        analysis['target']['love_score'] + 
-                        analysis['counterpart']['love_score']
-                    ) / 2
-                    pairs.append((senders[i], senders[j], combined_score))
-                except:
-                    continue
+        # Calculate scores for each sender
+        scores = []
+        for sender in unique_senders:
+            # Find their counterpart (the person they interact with most)
+            counterparts = [s for s in unique_senders if s != sender]
+            if not counterparts:
+                continue
+            
+            # Analyze with primary counterpart
+            try:
+                analysis = self.analyze_pair(sender, counterparts[0], confidence)
+                love_score = analysis['target']['love_score']
+                
+                scores.append({
+                    'sender': sender,
+                    'love_score': love_score,
+                    'message_count': sender_counts[sender]
+                })
+                if confidence is not None:
+                    scores[-1]['love_score_interval'] = analysis['target']['love_score_interval']
+            except:
+                # If analysis fails, assign based on message count
+                scores.append({
+                    'sender': sender,
+                    'love_score': min(100, sender_counts[sender] / 10),  # Simple fallback
+                    'message_count': sender_counts[sender]
+                })
+        
+        # Sort by love score descending
+        scores.sort(key=lambda x: x['love_score'], reverse=True)
+        
+        # Add rank
+        for idx, score in enumerate(scores, 1):
+            score['rank'] = idx
+        
+        return scores
+
+
+class PairAccumulator:
+    """
+    Running statistics of one (replier, replied_to) reply series.
+    Keeps regression sums (x = reply number), Welford mean/variance, the
+    fast-reply count and a quantile sketch for the median, so adding a
+    reply is O(1) and memory stays flat however long the chat runs.
+    """
+    __slots__ = ('count', 'sum_y', 'sum_xy', 'sum_yy', 'mean', 'm2', 'fast', 'sketch')
+    
+    def __init__(self):
+        self.count = 0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.sum_yy = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.fast = 0
+        self.sketch = ReplyTimeSketch()
+    
+    def add(self, y: float):
+        self.count += 1
+        self.sum_y += y
+        self.sum_xy += self.count * y
+        self.sum_yy += y * y
+        
+        # Welford update
+        delta = y - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (y - self.mean)
         
-        # Sort by combined score
-        pairs.sort(key=lambda x: x[2], reverse=True)
-        return pairs[:top_n]
+        if y <= FAST_REPLY_MINUTES:
+            self.fast += 1
+        self.sketch.add(y)
+    
+    def regression(self) -> RegressionResult:
+        n = self.count
+        if n < 2:
+            return RegressionResult(slope=0, intercept=self.mean, r=0, r2=0)
+        
+        sum_x = n * (n + 1) / 2
+        sum_xx = n * (n + 1) * (2 * n + 1) / 6
+        num = n * self.sum_xy - sum_x * self.sum_y
+        den = n * sum_xx - sum_x * sum_x
+        slope = num / den if den != 0 else 0
+        intercept = self.sum_y / n - slope * (sum_x / n)
+        
+        r_den = math.sqrt(max(den * (n * self.sum_yy - self.sum_y * self.sum_y), 0))
+        r = num / r_den if r_den != 0 else 0
+        return RegressionResult(slope, intercept, r, r * r)
+    
+    def stats(self) -> ParticipantStats:
+        n = self.count
+        if n == 0:
+            return ParticipantStats(0, 0, 0, 0, 0)
+        median = self.sketch.median()
+        std = math.sqrt(self.m2 / (n - 1)) if n > 1 else 0
+        return ParticipantStats(n, median, self.mean, std, self.fast / n)
+    
+    def love_score(self) -> LoveScore:
+        regression = self.regression()
+        stats = self.stats()
+        trend, speed, consistency, score = love_score_terms(
+            regression.slope, stats.median, stats.fast_rate, stats.std
+        )
+        return make_love_score(
+            stats.count, trend.item(), speed.item(), stats.fast_rate,
+            consistency.item(), score.item()
+        )
+
+class StreamingReplyAnalyzer:
+    """
+    Online counterpart of ReplyAnalyzer: feed messages one at a time with
+    update() and query any pair's love score at any moment, without
+    re-running the batch analysis over the whole history.
+    """
+    
+    def __init__(self):
+        self.pairs: Dict[Tuple[str, str], PairAccumulator] = {}
+        self.sender_sketches: Dict[str, ReplyTimeSketch] = {}
+        self._last_sender = None
+        self._last_timestamp = None
+    
+    def update(self, message) -> Optional[Tuple[str, str, float]]:
+        """
+        Add one message; returns (replier, replied_to, minutes) when it is a reply
+        """
+        sender = getattr(message, 'sender', None)
+        timestamp = getattr(message, 'timestamp', None)
+        if not sender or not isinstance(timestamp, datetime):
+            self._last_sender = None
+            self._last_timestamp = None
+            return None
+        
+        reply = None
+        if self._last_sender and self._last_sender != sender:
+            minutes = (timestamp - self._last_timestamp).total_seconds() / 60
+            key = (sender, self._last_sender)
+            accumulator = self.pairs.get(key)
+            if accumulator is None:
+                accumulator = self.pairs[key] = PairAccumulator()
+            accumulator.add(minutes)
+            sketch = self.sender_sketches.get(sender)
+            if sketch is None:
+                sketch = self.sender_sketches[sender] = ReplyTimeSketch()
+            sketch.add(minutes)
+            reply = (sender, self._last_sender, minutes)
+        
+        self._last_sender = sender
+        self._last_timestamp = timestamp
+        return reply
+    
+    def update_many(self, messages: List):
+        for message in messages:
+            self.update(message)
+    
+    def _pair(self, replier: str, replied_to: str) -> PairAccumulator:
+        return self.pairs.get((replier, replied_to)) or PairAccumulator()
+    
+    def reply_time_percentiles(self, replier: str, replied_to: Optional[str] = None,
+                               percentiles=(50, 90, 99)) -> Dict[str, float]:
+        """Reply time percentiles (minutes) of a sender, towards one counterpart or everyone"""
+        if replied_to is None:
+            sketch = self.sender_sketches.get(replier) or ReplyTimeSketch()
+        else:
+            sketch = self._pair(replier, replied_to).sketch
+        return sketch.percentiles(percentiles)
+    
+    def love_score(self, replier: str, replied_to: str) -> LoveScore:
+        """Current love score of `replier` answering `replied_to`"""
+        return self._pair(replier, replied_to).love_score()
+    
+    def analyze_pair(self, target: str, counterpart: str) -> Dict:
+        """Same report as ReplyAnalyzer.analyze_pair, from the running state"""
+        target_pair = self._pair(target, counterpart)
+        counterpart_pair = self._pair(counterpart, target)
+        return build_pair_report(
+            target, counterpart,
+            target_pair.regression(), counterpart_pair.regression(),
+            target_pair.stats(), counterpart_pair.stats(),
+            target_pair.love_score(), counterpart_pair.love_score()
+        )
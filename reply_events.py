@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Reply Event Extraction for WhatsApp Analyzer
+Walks the message list once and buckets every reply by
+(replier, replied_to) pair into compact NumPy arrays
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+
+class ReplyEvents:
+    """
+    All reply events of a chat, grouped by pair.
+
+    A reply is a message whose sender differs from the sender of the
+    message right before it. Events of pair k live in
+    [offsets[k], offsets[k + 1]) of the event arrays, in chat order:
+    - minutes: reply time in minutes (float64)
+    - times: timestamp of the reply (datetime64[us])
+    - positions: index of the reply in the original message list
+    Pairs are identified by replier * len(senders) + replied_to.
+    """
+
+    def __init__(self, senders, pair_keys, offsets, minutes, times, positions):
+        self.senders = senders
+        self.pair_keys = pair_keys
+        self.offsets = offsets
+        self.minutes = minutes
+        self.times = times
+        self.positions = positions
+        self._sender_index = {name: code for code, name in enumerate(senders)}
+
+    @classmethod
+    def from_messages(cls, messages):
+        """Extract reply events from Chatline-like objects in one pass"""
+        index = {}
+        codes = np.full(len(messages), -1, dtype=np.int64)
+        timestamps = np.full(len(messages), np.datetime64('NaT', 'us'), dtype='datetime64[us]')
+        for pos, m in enumerate(messages):
+            sender = getattr(m, 'sender', None)
+            timestamp = getattr(m, 'timestamp', None)
+            if sender:
+                codes[pos] = index.setdefault(sender, len(index))
+            if isinstance(timestamp, datetime):
+                timestamps[pos] = timestamp
+        return cls.from_columns(codes, timestamps, list(index))
+
+    @classmethod
+    def from_columns(cls, codes, timestamps, senders):
+        """
+        Extract reply events from aligned sender codes (-1 = no sender)
+        and datetime64 timestamps (NaT = no timestamp)
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        prev, curr = codes[:-1], codes[1:]
+        valid = (
+            (prev >= 0) & (curr >= 0) & (prev != curr)
+            & ~np.isnat(timestamps[:-1]) & ~np.isnat(timestamps[1:])
+        )
+        positions = np.flatnonzero(valid) + 1
+
+        keys = codes[positions] * len(senders) + codes[positions - 1]
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        positions = positions[order]
+
+        # Microseconds -> seconds -> minutes, as timedelta.total_seconds() / 60
+        deltas = (timestamps[positions] - timestamps[positions - 1]).astype(np.int64)
+        minutes = deltas / 1e6 / 60
+
+        pair_keys, starts = np.unique(keys, return_index=True)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        return cls(senders, pair_keys, offsets, minutes, timestamps[positions], positions)
+
+    def __len__(self):
+        """Number of reply events"""
+        return len(self.minutes)
+
+    @property
+    def pair_count(self):
+        return len(self.pair_keys)
+
+    def sender_code(self, name):
+        return self._sender_index.get(name)
+
+    def pair_codes(self):
+        """(replier codes, replied_to codes) of every pair bucket"""
+        size = max(len(self.senders), 1)
+        return self.pair_keys // size, self.pair_keys % size
+
+    def bucket(self, replier, replied_to):
+        """Slice of the event arrays holding replies of `replier` to `replied_to`"""
+        i = self._sender_index.get(replier)
+        j = self._sender_index.get(replied_to)
+        if i is None or j is None:
+            return slice(0, 0)
+        key = i * len(self.senders) + j
+        k = np.searchsorted(self.pair_keys, key)
+        if k == len(self.pair_keys) or self.pair_keys[k] != key:
+            return slice(0, 0)
+        return slice(int(self.offsets[k]), int(self.offsets[k + 1]))
+
+    def reply_minutes(self, replier, replied_to):
+        """Reply times (minutes) of `replier` answering `replied_to`, in chat order"""
+        return self.minutes[self.bucket(replier, replied_to)]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sparse Reply Graph for WhatsApp Analyzer
+Undirected graph holding only the sender pairs that actually replied to
+each other, with a heap-based top-k ranking by combined love score
+"""
+
+import heapq
+
+import numpy as np
+
+
+class ReplyGraph:
+    """
+    Edges between senders with at least one reply event, in either direction.
+    - first / second: sender codes of each edge (first < second)
+    - replies: reply events of the edge, both directions together
+    - scores: combined love score, the mean of both directions' rounded
+      scores (a direction without replies counts as 0)
+
+    Pairs that never interacted are not stored, so a group of P senders
+    costs O(edges) instead of O(P^2).
+    """
+
+    def __init__(self, senders, first, second, replies, scores):
+        self.senders = senders
+        self.first = first
+        self.second = second
+        self.replies = replies
+        self.scores = scores
+
+    @classmethod
+    def from_events(cls, events, series_scores):
+        """Fold the directed reply buckets of ReplyEvents and their SeriesScores into edges"""
+        size = max(len(events.senders), 1)
+        repliers, replied_to = events.pair_codes()
+        first = np.minimum(repliers, replied_to)
+        second = np.maximum(repliers, replied_to)
+        edge_keys, inverse = np.unique(first * size + second, return_inverse=True)
+
+        m = len(edge_keys)
+        replies = np.bincount(inverse, weights=np.diff(events.offsets), minlength=m)
+        scores = np.bincount(inverse, weights=np.round(series_scores.score), minlength=m) / 2
+        return cls(events.senders, edge_keys // size, edge_keys % size,
+                   replies.astype(np.int64), scores)
+
+    def __len__(self):
+        """Number of interacting pairs"""
+        return len(self.first)
+
+    def top_pairs(self, k, min_replies=1):
+        """
+        The k pairs with the highest combined score among those with at
+        least `min_replies` reply events, as (person1, person2, score)
+        """
+        eligible = np.flatnonzero(self.replies >= min_replies)
+        scores = self.scores.tolist()
+        best = heapq.nlargest(k, eligible.tolist(), key=scores.__getitem__)
+        return [
+            (self.senders[self.first[e]], self.senders[self.second[e]], scores[e])
+            for e in best
+        ]
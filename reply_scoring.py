@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Vectorized Love Score Kernel for WhatsApp Analyzer
+Scores one or many reply series at once from float64 arrays of reply
+times; series are laid out back to back and delimited by offsets
+"""
+
+import numpy as np
+
+FAST_REPLY_MINUTES = 5   # A reply within this many minutes counts as fast
+SLOPE_SCALE = 0.5        # Minutes per reply of speed-up for a full trend score
+MEDIAN_CAP = 120         # Median reply time (minutes) scoring zero
+STD_CAP = 60             # Standard deviation (minutes) scoring zero
+BOOTSTRAP_RESAMPLES = 1000     # Resamples behind a love score interval
+BOOTSTRAP_BLOCK_SIZE = 2 ** 22  # Resampled values held in memory at once
+
+WEIGHTS = {
+    'trend': 0.35,        # Reply speed trend
+    'speed': 0.35,        # Central tendency
+    'fast_rate': 0.20,    # Fast replies share
+    'consistency': 0.10   # Variability
+}
+
+
+class SeriesScores:
+    """Per-series statistics and love score components, one array entry per series"""
+
+    FIELDS = (
+        'count', 'slope', 'intercept', 'r', 'r2', 'median', 'mean', 'std',
+        'fast_rate', 'trend', 'speed', 'consistency', 'score'
+    )
+
+    def __init__(self, **arrays):
+        for field in self.FIELDS:
+            setattr(self, field, arrays[field])
+
+    def __len__(self):
+        return len(self.count)
+
+    def row(self, i):
+        """Plain-float dict of series i"""
+        return {field: getattr(self, field)[i].item() for field in self.FIELDS}
+
+
+def love_score_terms(slope, median, fast_rate, std):
+    """
+    Scaled love score components (each 0-1) and the weighted 0-100 score.
+    Works on scalars and arrays alike.
+    """
+    # Negative slope is better (getting faster over time)
+    trend = np.clip(-np.asarray(slope, dtype=np.float64) / SLOPE_SCALE, 0, 1)
+    # Median reply time - closer to 0 is better
+    speed = np.clip((MEDIAN_CAP - np.minimum(median, MEDIAN_CAP)) / MEDIAN_CAP, 0, 1)
+    fast_rate = np.asarray(fast_rate, dtype=np.float64)
+    # Consistency - lower std deviation is better
+    consistency = np.clip(1 - np.minimum(std, STD_CAP) / STD_CAP, 0, 1)
+
+    score = 100 * (
+        WEIGHTS['trend'] * trend
+        + WEIGHTS['speed'] * speed
+        + WEIGHTS['fast_rate'] * fast_rate
+        + WEIGHTS['consistency'] * consistency
+    )
+    return trend, speed, consistency, score
+
+
+def score_segments(values, offsets):
+    """
+    Score every series values[offsets[k]:offsets[k + 1]], where offsets
+    runs from 0 to len(values). Replies are numbered 1..n within each
+    series (the regression x).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    m = len(counts)
+    seg = np.repeat(np.arange(m), counts)
+    n = counts.astype(np.float64)
+    safe_n = np.maximum(n, 1)
+
+    # Regression sums; x = 1..n has closed forms
+    x = np.arange(len(values)) - np.repeat(offsets[:-1], counts) + 1.0
+    sum_x = n * (n + 1) / 2
+    sum_xx = n * (n + 1) * (2 * n + 1) / 6
+    sum_y = np.bincount(seg, weights=values, minlength=m)
+    sum_xy = np.bincount(seg, weights=x * values, minlength=m)
+    sum_yy = np.bincount(seg, weights=values * values, minlength=m)
+
+    num = n * sum_xy - sum_x * sum_y
+    den = n * sum_xx - sum_x * sum_x
+    slope = np.divide(num, den, out=np.zeros(m), where=den != 0)
+    mean = sum_y / safe_n
+    intercept = mean - slope * (sum_x / safe_n)
+
+    r_den = np.sqrt(np.maximum(den * (n * sum_yy - sum_y * sum_y), 0))
+    r = np.divide(num, r_den, out=np.zeros(m), where=r_den != 0)
+
+    # Series with fewer than two replies have no trend
+    short = counts < 2
+    slope[short] = 0
+    r[short] = 0
+
+    # Sample standard deviation, two-pass for accuracy
+    dev = values - mean[seg]
+    ss = np.bincount(seg, weights=dev * dev, minlength=m)
+    std = np.sqrt(np.divide(ss, n - 1, out=np.zeros(m), where=counts > 1))
+
+    # Median from a per-series sort: by value, then stable by series
+    order = np.argsort(values)
+    order = order[np.argsort(seg[order], kind='stable')]
+    sorted_values = values[order]
+    median = np.zeros(m)
+    filled = counts > 0
+    lo = (offsets[:-1] + (counts - 1) // 2)[filled]
+    hi = (offsets[:-1] + counts // 2)[filled]
+    median[filled] = (sorted_values[lo] + sorted_values[hi]) / 2
+
+    fast_rate = np.bincount(seg, weights=values <= FAST_REPLY_MINUTES, minlength=m) / safe_n
+
+    trend, speed, consistency, score = love_score_terms(slope, median, fast_rate, std)
+    score = np.where(filled, score, 0)
+
+    return SeriesScores(
+        count=counts, slope=slope, intercept=intercept, r=r, r2=r * r,
+        median=median, mean=mean, std=std, fast_rate=fast_rate,
+        trend=trend, speed=speed, consistency=consistency, score=score
+    )
+
+
+def score_series(values):
+    """Score a single reply series"""
+    return score_segments(values, [0, len(values)])
+
+
+def bootstrap_scores(values, resamples=BOOTSTRAP_RESAMPLES, seed=None):
+    """
+    Love scores of `resamples` bootstrap resamples of one reply series.
+    Each row of a (resamples, n) index matrix draws n replies with
+    replacement; replies keep their reply number, so the trend is fitted
+    on the resampled (x, y) points. Rows are processed in blocks to bound
+    memory on long series.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.zeros(resamples)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, BOOTSTRAP_BLOCK_SIZE // n)
+    scores = np.empty(resamples)
+    for start in range(0, resamples, block):
+        rows = min(block, resamples - start)
+        index = rng.integers(0, n, size=(rows, n))
+        y = values[index]
+        x = index + 1.0
+
+        x_dev = x - x.mean(axis=1, keepdims=True)
+        sxx = np.einsum('ij,ij->i', x_dev, x_dev)
+        sxy = np.einsum('ij,ij->i', x_dev, y)
+        slope = np.divide(sxy, sxx, out=np.zeros(rows), where=sxx != 0)
+        std = y.std(axis=1, ddof=1) if n > 1 else np.zeros(rows)
+        median = np.median(y, axis=1)
+        fast_rate = (y <= FAST_REPLY_MINUTES).mean(axis=1)
+
+        _, _, _, scores[start:start + rows] = love_score_terms(slope, median, fast_rate, std)
+    return scores
+
+
+def score_interval(values, confidence=0.95, resamples=BOOTSTRAP_RESAMPLES, seed=None):
+    """Bootstrap percentile interval (low, high) of a series' love score, rounded like the score"""
+    scores = bootstrap_scores(values, resamples, seed)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(scores, [tail, 100 - tail])
+    return round(float(low)), round(float(high))
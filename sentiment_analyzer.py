@@ -5,78 +5,86 @@ Sentiment Analysis Module for WhatsApp Analyzer
 Analyzes emotional tone and sentiment of messages
 """
 
-import re
-from collections import Counter
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+import sentiment_packs
+from memo import Memo, normalize_body
+from message_arrays import MessageArrays
+from time_index import period_ids
+
+POSITIVE_THRESHOLD = 0.2   # Scores above this are positive
+NEGATIVE_THRESHOLD = -0.2  # Scores below this are negative
+LABELS = {-1: 'negative', 0: 'neutral', 1: 'positive'}
+
+
+class SentimentScores:
+    """Sentiment of a batch of messages, one array entry per message"""
+    
+    FIELDS = ('score', 'confidence', 'positive', 'negative', 'label')
+    
+    def __init__(self, **arrays):
+        for field in self.FIELDS:
+            setattr(self, field, arrays[field])
+    
+    def __len__(self):
+        return len(self.score)
+    
+    def sentiments(self):
+        """Label names ('positive' / 'neutral' / 'negative') of every message"""
+        return [LABELS[label] for label in self.label.tolist()]
+    
+    def take(self, index):
+        """Scores of a subset of the messages (a slice, mask or index array)"""
+        return SentimentScores(**{field: getattr(self, field)[index] for field in self.FIELDS})
+
+
+# Analyzer of a pool worker process, created once by the pool initializer
+_worker_analyzer = None
+
+
+def _init_worker(language):
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(language)
+
+
+def _count_chunk(texts):
+    return _worker_analyzer.count_texts(texts)
+
 
 class SentimentAnalyzer:
     """Simple rule-based sentiment analyzer"""
     
     def __init__(self, language='en'):
         self.language = language
-        self.sentiment_words = self._load_sentiment_words()
+        try:
+            self.pack_language = sentiment_packs.resolve_language(language)
+        except ValueError:
+            self.pack_language = sentiment_packs.resolve_language('en')
+        # Compiled once per process and shared by every analyzer
+        self.lexicon = sentiment_packs.get_lexicon(self.pack_language)
+        # Lexicon counts of each distinct normalized body
+        self.memo = Memo(self.lexicon.count, normalize=normalize_body)
+    
+    @property
+    def sentiment_words(self):
+        """Word lists of the language pack (positive, negative, negations)"""
+        return self._load_sentiment_words()
     
     def _load_sentiment_words(self):
-        """Load sentiment word dictionaries"""
-        # Basic sentiment lexicon (expandable)
-        sentiments = {
-            'en': {
-                'positive': [
-                    'good', 'great', 'awesome', 'excellent', 'amazing', 'wonderful',
-                    'fantastic', 'love', 'happy', 'joy', 'best', 'perfect',
-                    'beautiful', 'brilliant', 'glad', 'pleased', 'excited',
-                    'thanks', 'thank', 'appreciate', 'nice', 'cool', 'super',
-                    '😊', '😄', '😃', '❤️', '👍', '🎉', '✨', '👏', '💯', '🔥'
-                ],
-                'negative': [
-                    'bad', 'terrible', 'awful', 'horrible', 'hate', 'worst',
-                    'sad', 'angry', 'disappointed', 'annoying', 'stupid',
-                    'wrong', 'problem', 'issue', 'difficult', 'hard',
-                    'sorry', 'unfortunately', 'failure', 'fail', 'poor',
-                    '😢', '😭', '😠', '😡', '💔', '👎', '😞', '😔', '😟'
-                ]
-            },
-            'id': {
-                'positive': [
-                    'bagus', 'baik', 'senang', 'suka', 'mantap', 'keren',
-                    'hebat', 'sempurna', 'terima kasih', 'thanks', 'makasih',
-                    'gembira', 'bahagia', 'indah', 'cantik', 'lucu',
-                    '😊', '😄', '😃', '❤️', '👍', '🎉', '✨', '👏', '💯', '🔥'
-                ],
-                'negative': [
-                    'jelek', 'buruk', 'sedih', 'marah', 'kecewa', 'benci',
-                    'susah', 'sulit', 'masalah', 'problem', 'salah', 'gagal',
-                    'bodoh', 'parah', 'maaf', 'sayangnya', 'aneh',
-                    '😢', '😭', '😠', '😡', '💔', '👎', '😞', '😔', '😟'
-                ]
-            }
-        }
-        
-        return sentiments.get(self.language, sentiments['en'])
+        """Load sentiment word dictionaries from sentiment-words/"""
+        pack = sentiment_packs.load_language(self.pack_language)
+        return {key: list(words) for key, words in pack.items()}
     
     def analyze_text(self, text):
         """Analyze sentiment of a text"""
         if not text:
             return {'sentiment': 'neutral', 'score': 0, 'confidence': 0}
         
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
-        
-        positive_count = 0
-        negative_count = 0
-        
-        # Check words
-        for word in words:
-            if word in self.sentiment_words['positive']:
-                positive_count += 1
-            elif word in self.sentiment_words['negative']:
-                negative_count += 1
-        
-        # Check emojis in original text
-        for emoji_char in text:
-            if emoji_char in self.sentiment_words['positive']:
-                positive_count += 1
-            elif emoji_char in self.sentiment_words['negative']:
-                negative_count += 1
+        positive_count, negative_count, word_count = self.memo(text)
         
         # Calculate sentiment
         total = positive_count + negative_count
@@ -85,11 +93,11 @@ class SentimentAnalyzer:
             return {'sentiment': 'neutral', 'score': 0, 'confidence': 0}
         
         score = (positive_count - negative_count) / total
-        confidence = total / len(words) if words else 0
+        confidence = total / word_count if word_count else 0
         
-        if score > 0.2:
+        if score > POSITIVE_THRESHOLD:
             sentiment = 'positive'
-        elif score < -0.2:
+        elif score < NEGATIVE_THRESHOLD:
             sentiment = 'negative'
         else:
             sentiment = 'neutral'
@@ -102,17 +110,168 @@ class SentimentAnalyzer:
             'negative_words': negative_count
         }
     
-    def analyze_conversation(self, messages):
-        """Analyze sentiment of entire conversation"""
-        sentiments = []
+    def count_texts(self, texts):
+        """(positive, negative, word count) int32 arrays of a list of bodies"""
+        n = len(texts)
+        positive = np.zeros(n, dtype=np.int32)
+        negative = np.zeros(n, dtype=np.int32)
+        words = np.zeros(n, dtype=np.int32)
+        count = self.memo
+        for i, text in enumerate(texts):
+            if text:
+                positive[i], negative[i], words[i] = count(text)
+        return positive, negative, words
+    
+    def _count_parallel(self, texts, max_workers):
+        """count_texts over chunks in a process pool; chunks come back in order"""
+        chunk = config.SENTIMENT_CHUNK_SIZE
+        chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.pack_language,)) as pool:
+            parts = list(pool.map(_count_chunk, chunks))
+        return tuple(np.concatenate(column) for column in zip(*parts))
+    
+    def analyze_batch(self, messages, parallel=False, max_workers=config.MAX_WORKERS):
+        """
+        Score many messages in one call
+        messages: strings or objects with a `body` (Chatline); empty ones score 0
+        parallel: opt-in; score chunks of config.SENTIMENT_CHUNK_SIZE in a
+        process pool when config.PARALLEL_PROCESSING is on and there are at
+        least config.SENTIMENT_PARALLEL_MIN_MESSAGES messages, with up to
+        max_workers processes and never more than the machine has cores
+        Returns SentimentScores with one entry per message
+        """
+        texts = [
+            message if isinstance(message, str) else getattr(message, 'body', None)
+            for message in messages
+        ]
+        n = len(texts)
+        workers = min(max_workers, os.cpu_count() or 1)
+        if (parallel and config.PARALLEL_PROCESSING and workers > 1
+                and n >= config.SENTIMENT_PARALLEL_MIN_MESSAGES
+                and n > config.SENTIMENT_CHUNK_SIZE):
+            positive, negative, words = self._count_parallel(texts, workers)
+        else:
+            positive, negative, words = self.count_texts(texts)
+        
+        total = positive + negative
+        score = np.divide(positive - negative, total, out=np.zeros(n), where=total > 0)
+        confidence = np.minimum(
+            np.divide(total, words, out=np.zeros(n), where=(words > 0) & (total > 0)), 1.0
+        )
+        label = (
+            (score > POSITIVE_THRESHOLD).astype(np.int8)
+            - (score < NEGATIVE_THRESHOLD).astype(np.int8)
+        )
+        return SentimentScores(
+            score=score, confidence=confidence, positive=positive, negative=negative, label=label
+        )
+    
+    def cache_info(self):
+        """Hits, misses, size and hit rate of the body memo"""
+        return self.memo.info()
+    
+    def analyze_chat(self, messages):
+        """
+        Score every message with a sender, a timestamp and a body
+        Returns (SentimentScores, MessageArrays), aligned entry by entry
+        """
+        kept = [
+            m for m in messages
+            if getattr(m, 'sender', None) and getattr(m, 'timestamp', None) and getattr(m, 'body', None)
+        ]
+        return self.analyze_batch(kept), MessageArrays.from_messages(kept)
+    
+    def aggregate_by_sender(self, scores, codes, senders):
+        """
+        Per-sender sentiment from score arrays aligned with sender codes
+        Returns the same dict as get_sender_sentiment
+        """
+        codes = np.asarray(codes)
+        m = len(senders)
+        total = np.bincount(codes, minlength=m)
+        label_counts = {
+            name: np.bincount(codes[scores.label == label], minlength=m)
+            for label, name in LABELS.items()
+        }
+        score_sum = np.bincount(codes, weights=scores.score, minlength=m)
+        safe_total = np.maximum(total, 1)
+        
+        sender_sentiments = {}
+        for code in np.flatnonzero(total).tolist():
+            sender_sentiments[senders[code]] = {
+                'positive': int(label_counts['positive'][code]),
+                'negative': int(label_counts['negative'][code]),
+                'neutral': int(label_counts['neutral'][code]),
+                'total': int(total[code]),
+                'avg_score': float(score_sum[code] / safe_total[code]),
+                'positive_ratio': float(label_counts['positive'][code] / safe_total[code]),
+                'negative_ratio': float(label_counts['negative'][code] / safe_total[code])
+            }
+        return sender_sentiments
+    
+    def aggregate_by_period(self, scores, times, period='day'):
+        """
+        Sentiment per calendar period ('day', 'week', 'month' or a number
+        of days) from score arrays aligned with datetime64 timestamps
+        Returns a dict of arrays over the active periods: start, count,
+        mean_score, positive, negative, neutral
+        """
+        times = np.asarray(times)
+        valid = ~np.isnat(times)
+        ids, period_start = period_ids(times[valid], period)
+        if len(ids) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return {
+                'start': np.zeros(0, dtype='datetime64[D]'), 'count': empty,
+                'mean_score': np.zeros(0), 'positive': empty, 'negative': empty, 'neutral': empty
+            }
+        
+        first = ids.min()
+        bins = ids - first
+        m = int(bins.max()) + 1
+        label = scores.label[valid]
+        count = np.bincount(bins, minlength=m)
+        active = np.flatnonzero(count)
+        score_sum = np.bincount(bins, weights=scores.score[valid], minlength=m)
         
-        for msg in messages:
-            if hasattr(msg, 'body') and msg.body:
-                result = self.analyze_text(msg.body)
-                if msg.sender:
-                    result['sender'] = msg.sender
-                    result['timestamp'] = msg.timestamp
-                sentiments.append(result)
+        timeline = {
+            'start': np.array([period_start(first + i) for i in active.tolist()], dtype='datetime64[D]'),
+            'count': count[active],
+            'mean_score': score_sum[active] / count[active]
+        }
+        for value, name in LABELS.items():
+            timeline[name] = np.bincount(bins[label == value], minlength=m)[active]
+        return timeline
+    
+    def analyze_conversation(self, messages, parallel=False, max_workers=config.MAX_WORKERS):
+        """
+        Analyze sentiment of entire conversation
+        Messages are scored with analyze_batch (parallel is passed on);
+        returns one analyze_text-style dict per message with a body
+        """
+        kept = [msg for msg in messages if hasattr(msg, 'body') and msg.body]
+        scores = self.analyze_batch(kept, parallel, max_workers)
+        labels = scores.sentiments()
+        
+        sentiments = []
+        for i, msg in enumerate(kept):
+            positive = int(scores.positive[i])
+            negative = int(scores.negative[i])
+            if positive + negative == 0:
+                result = {'sentiment': 'neutral', 'score': 0, 'confidence': 0}
+            else:
+                result = {
+                    'sentiment': labels[i],
+                    'score': float(scores.score[i]),
+                    'confidence': float(scores.confidence[i]),
+                    'positive_words': positive,
+                    'negative_words': negative
+                }
+            if msg.sender:
+                result['sender'] = msg.sender
+                result['timestamp'] = msg.timestamp
+            sentiments.append(result)
         
         return sentiments
     
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sentiment Lexicon for WhatsApp Analyzer
+Compiles words, multi-word phrases and emoji into a token trie, so a
+message is scored in one linear scan: one regex pass splits it into
+word and emoji tokens, and one walk over the tokens finds every entry
+and applies negation windows
+"""
+
+import re
+
+NEGATION_WINDOW = 3  # Entries up to this many tokens after a negator are flipped
+CLAUSE_BREAKS = frozenset('.,;!?')  # Punctuation ending a negation window
+WORD_PATTERN = r"\w+n't|\w+"  # "don't", "can't" stay one token
+
+
+class SentimentLexicon:
+    """
+    Lexicon entries mapped to weights (positive > 0, negative < 0).
+    - trie: nested dicts keyed by token; the weight of an entry ending at
+      a node is stored under the None key
+    - symbols: entries without word characters (emoji), recognised as
+      single tokens by the tokenizer
+    - negations: tokens that flip the sign of the next entries
+      (within NEGATION_WINDOW tokens, up to the next clause break)
+    Matching is leftmost-longest, so 'terima kasih' wins over 'terima'.
+    """
+
+    def __init__(self, weights, negations=()):
+        self.weights = weights
+        self.negations = frozenset(negations)
+        self.symbols = frozenset(e for e in weights if not re.search(r'\w', e))
+        # Longest symbols first, so multi-codepoint emoji win over their prefixes
+        alternatives = [re.escape(s) for s in sorted(self.symbols, key=len, reverse=True)]
+        breaks = '[' + re.escape(''.join(sorted(CLAUSE_BREAKS))) + ']'
+        self._token_pattern = re.compile('|'.join([WORD_PATTERN] + alternatives + [breaks]))
+
+        self.trie = {}
+        for entry, weight in weights.items():
+            node = self.trie
+            for token in self.tokenize(entry):
+                node = node.setdefault(token, {})
+            node[None] = weight
+
+    @classmethod
+    def from_lists(cls, positive, negative, negations=()):
+        """Weight +1 for positive and -1 for negative entries; positive wins on overlap"""
+        weights = {entry.lower(): -1.0 for entry in negative}
+        weights.update((entry.lower(), 1.0) for entry in positive)
+        return cls(weights, (word.lower() for word in negations))
+
+    def tokenize(self, text):
+        """Lowercased word, emoji and clause-break tokens of a text, in order"""
+        return self._token_pattern.findall(text.lower().replace('\u2019', "'"))
+
+    def match(self, tokens):
+        """Weights of every entry found in a token list, negation applied"""
+        trie = self.trie
+        negations = self.negations
+        matched = []
+        last_negation = -NEGATION_WINDOW - 1
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = trie
+            end = weight = None
+            j = i
+            while j < n and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if None in node:
+                    end, weight = j, node[None]
+            if end is None:
+                if tokens[i] in negations:
+                    last_negation = i
+                elif tokens[i] in CLAUSE_BREAKS:
+                    last_negation = -NEGATION_WINDOW - 1
+                i += 1
+                continue
+            if i - last_negation <= NEGATION_WINDOW:
+                weight = -weight
+            matched.append(weight)
+            i = end
+        return matched
+
+    def count(self, text):
+        """(positive matches, negative matches, word count) of a text"""
+        tokens = self.tokenize(text)
+        matched = self.match(tokens)
+        positive = sum(1 for weight in matched if weight > 0)
+        symbols = self.symbols
+        words = sum(1 for token in tokens if token not in symbols and token not in CLAUSE_BREAKS)
+        return positive, len(matched) - positive, words
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sentiment Language Packs for WhatsApp Analyzer
+Loads each sentiment lexicon from sentiment-words/ on first use and
+compiles it once per process; every analyzer shares the compiled copy
+"""
+
+import io
+import json
+from functools import lru_cache
+
+import config
+from sentiment_lexicon import SentimentLexicon
+
+LANGUAGES_FILE = config.SENTIMENT_WORDS_DIR / "languages.json"
+
+
+@lru_cache(maxsize=1)
+def available_languages():
+    """Map of language code -> language name, as listed in languages.json"""
+    with io.open(LANGUAGES_FILE, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def resolve_language(language):
+    """Accept either a code ('en') or a name ('english') and return the name"""
+    language = language.strip().lower()
+    languages = available_languages()
+    if language in languages:
+        return languages[language]
+    if language in languages.values():
+        return language
+    raise ValueError(f"Unknown sentiment language: {language!r}")
+
+
+@lru_cache(maxsize=None)
+def load_file(path):
+    """Load a sentiment pack file: {"positive": [...], "negative": [...], "negations": [...]}"""
+    with io.open(path, "r", encoding="utf-8") as file:
+        pack = json.load(file)
+    return {key: tuple(pack.get(key, ())) for key in ('positive', 'negative', 'negations')}
+
+
+def load_language(language):
+    """Word lists of the bundled pack of one language (code or name)"""
+    name = resolve_language(language)
+    return load_file(str(config.SENTIMENT_WORDS_DIR / f"{name}.json"))
+
+
+@lru_cache(maxsize=None)
+def _compile(name):
+    pack = load_language(name)
+    return SentimentLexicon.from_lists(pack['positive'], pack['negative'], pack['negations'])
+
+
+def get_lexicon(language):
+    """Compiled lexicon of one language, built on first use and then shared"""
+    return _compile(resolve_language(language))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Conversation Sessionization for WhatsApp Analyzer
+Splits a chat into conversations wherever the silence between two
+messages exceeds a gap threshold, and keeps a compact session index
+"""
+
+import numpy as np
+
+import config
+
+
+class SessionIndex:
+    """
+    Compact index of conversations over MessageArrays.
+    Session i covers messages [starts[i], ends[i]) of the arrays.
+    """
+
+    def __init__(self, arrays, starts, ends):
+        self.arrays = arrays
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def slices(self):
+        """Yield one slice per session, usable on any list aligned with the arrays"""
+        for start, end in zip(self.starts.tolist(), self.ends.tolist()):
+            yield slice(start, end)
+
+    @property
+    def starters(self):
+        """Sender code of the first message of each session"""
+        return self.arrays.codes[self.starts]
+
+    @property
+    def enders(self):
+        """Sender code of the last message of each session"""
+        return self.arrays.codes[self.ends - 1]
+
+    def lengths(self):
+        """Number of messages in each session"""
+        return self.ends - self.starts
+
+    def durations(self):
+        """Duration of each session in minutes"""
+        if not len(self):
+            return np.zeros(0)
+        times = self.arrays.times
+        return (times[self.ends - 1] - times[self.starts]).astype(np.int64) / 60.0
+
+    def participant_counts(self):
+        """Number of distinct senders in each session"""
+        session_ids = np.repeat(np.arange(len(self)), self.lengths())
+        keys = session_ids.astype(np.int64) * self.arrays.sender_count + self.arrays.codes
+        return np.bincount(
+            np.unique(keys) // max(self.arrays.sender_count, 1), minlength=len(self)
+        )
+
+    def participants(self, i):
+        """Names of the senders taking part in session i"""
+        codes = np.unique(self.arrays.codes[self.starts[i]:self.ends[i]])
+        return [self.arrays.senders[c] for c in codes]
+
+    def initiator_counts(self):
+        """(sender, sessions started) sorted by count"""
+        return self._count_by_sender(self.starters)
+
+    def closer_counts(self):
+        """(sender, sessions ended) sorted by count"""
+        return self._count_by_sender(self.enders)
+
+    def _count_by_sender(self, codes):
+        counts = np.bincount(codes, minlength=self.arrays.sender_count)
+        return sorted(
+            ((self.arrays.senders[c], int(n)) for c, n in enumerate(counts) if n),
+            key=lambda x: x[1],
+            reverse=True
+        )
+
+
+def sessionize(arrays, gap_minutes=config.CONVERSATION_GAP_MINUTES):
+    """
+    Split messages into sessions in one pass: a new session starts whenever
+    more than gap_minutes elapsed since the previous message.
+    """
+    n = len(arrays)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return SessionIndex(arrays, empty, empty)
+
+    gaps = np.diff(arrays.times) > np.timedelta64(int(gap_minutes * 60), 's')
+    starts = np.concatenate(([0], np.flatnonzero(gaps) + 1)).astype(np.int64)
+    ends = np.append(starts[1:], n)
+    return SessionIndex(arrays, starts, ends)
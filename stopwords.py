@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Stop Words Registry for WhatsApp Analyzer
+Loads each stop-word list once per process and shares it as a frozenset
+"""
+
+import io
+import json
+from functools import lru_cache
+
+import config
+
+LANGUAGES_FILE = config.STOP_WORDS_DIR / "languages.json"
+
+
+@lru_cache(maxsize=1)
+def available_languages():
+    """Map of language code -> language name, as listed in languages.json"""
+    with io.open(LANGUAGES_FILE, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def resolve_language(language):
+    """Accept either a code ('en') or a name ('english') and return the name"""
+    language = language.strip().lower()
+    languages = available_languages()
+    if language in languages:
+        return languages[language]
+    if language in languages.values():
+        return language
+    raise ValueError(f"Unknown stop words language: {language!r}")
+
+
+@lru_cache(maxsize=None)
+def load_file(path):
+    """Load a stop words file (one word per line) into a frozenset"""
+    with io.open(path, "r", encoding="utf-8") as file:
+        return frozenset(
+            word for word in (line.strip().lower() for line in file) if word
+        )
+
+
+def load_language(language):
+    """Load the bundled stop words for one language (code or name)"""
+    name = resolve_language(language)
+    return load_file(str(config.STOP_WORDS_DIR / f"{name}.txt"))
+
+
+@lru_cache(maxsize=None)
+def _union(languages, custom_files):
+    words = set()
+    for language in languages:
+        words |= load_language(language)
+    for path in custom_files:
+        words |= load_file(path)
+    return frozenset(words)
+
+
+def get_stop_words(languages=(), custom_files=()):
+    """
+    Union of the stop words of several languages and custom files.
+    Every source is read once per process; repeated calls are free.
+    """
+    if isinstance(languages, str):
+        languages = [languages]
+    if isinstance(custom_files, str):
+        custom_files = [custom_files]
+    return _union(
+        tuple(sorted(resolve_language(lang) for lang in languages)),
+        tuple(sorted(str(path) for path in custom_files))
+    )
+
+
+def make_word_filter(stop_words=frozenset(), min_length=config.MIN_WORD_LENGTH):
+    """
+    Build a predicate telling whether a word is worth counting:
+    longer than min_length, alphanumeric, not a number and not a stop word
+    """
+    stop_words = frozenset(stop_words)
+
+    def is_countable(word):
+        return (
+            len(word) > min_length
+            and word.isalnum()
+            and not word.isnumeric()
+            and word.lower() not in stop_words
+        )
+
+    return is_countable
@@ -22,6 +22,8 @@ import re
 
 from chatline import Chatline
 from reply_analyzer import ReplyAnalyzer
+from stopwords import get_stop_words
+from time_index import TimeIndex
 
 # Page config
 st.set_page_config(
@@ -91,15 +93,15 @@ with st.sidebar:
     show_calendar_heatmap = st.checkbox("🔥 Calendar Heatmap", value=True)
     show_statistics = st.checkbox("📊 Statistics", value=True)
 
+@st.cache_resource
 def load_stop_words(language):
     """Load stop words for given language"""
     if language == "None":
-        return []
+        return frozenset()
     try:
-        with open(f'stop-words/{language}.txt', 'r', encoding='utf-8') as f:
-            return [line.strip().lower() for line in f if line.strip()]
+        return get_stop_words(language)
     except:
-        return []
+        return frozenset()
 
 def parse_chat_file(file_content, start_date=None, end_date=None):
     """Parse WhatsApp chat file"""
@@ -109,18 +111,13 @@ def parse_chat_file(file_content, start_date=None, end_date=None):
     for line in lines:
         if line.strip():
             chatline = Chatline(line)
-            
-            # Date filtering
-            if start_date and end_date and chatline.timestamp:
-                try:
-                    msg_date = datetime.strptime(chatline.timestamp.split(',')[0], '%d/%m/%y')
-                    if not (start_date <= msg_date.date() <= end_date):
-                        continue
-                except:
-                    pass
-            
             chats.append(chatline)
     
+    # Date filtering on the parsed timestamps
+    if start_date and end_date:
+        time_index = TimeIndex.from_messages(chats)
+        chats = time_index.select(chats, time_index.locate(start_date, end_date))
+    
     return chats
 
 def get_basic_stats(chats, stop_words):
@@ -15,6 +15,8 @@ import re
 
 from chatline import Chatline
 from reply_analyzer import ReplyAnalyzer
+from stopwords import get_stop_words
+from time_index import TimeIndex
 
 # Page config
 st.set_page_config(
@@ -69,14 +71,14 @@ with st.sidebar:
     show_word_cloud = st.checkbox("☁️ Word Cloud", value=True)
     show_calendar = st.checkbox("🔥 Calendar Heatmap", value=True)
 
+@st.cache_resource
 def load_stop_words(language):
     if language == "None":
-        return []
+        return frozenset()
     try:
-        with open(f'stop-words/{language}.txt', 'r', encoding='utf-8') as f:
-            return [line.strip().lower() for line in f if line.strip()]
+        return get_stop_words(language)
     except:
-        return []
+        return frozenset()
 
 def parse_chats(file_content, start_date=None, end_date=None):
     chats = []
@@ -86,25 +88,14 @@ def parse_chats(file_content, start_date=None, end_date=None):
         if line.strip():
             try:
                 chatline = Chatline(line)
-                
-                if start_date and end_date and chatline.timestamp:
-                    try:
-                        date_str = chatline.timestamp.split(',')[0].strip().replace('[', '')
-                        for fmt in ['%d/%m/%y', '%m/%d/%y']:
-                            try:
-                                msg_date = datetime.strptime(date_str, fmt).date()
-                                if not (start_date <= msg_date <= end_date):
-                                    continue
-                                break
-                            except:
-                                continue
-                    except:
-                        pass
-                
                 chats.append(chatline)
             except:
                 continue
     
+    if start_date and end_date:
+        time_index = TimeIndex.from_messages(chats)
+        chats = time_index.select(chats, time_index.locate(start_date, end_date))
+    
     return chats
 
 # Main
@@ -18,6 +18,8 @@ import traceback
 
 from chatline import Chatline
 from reply_analyzer import ReplyAnalyzer
+from stopwords import get_stop_words
+from time_index import TimeIndex
 
 # Page config
 st.set_page_config(
@@ -88,16 +90,16 @@ with st.sidebar:
     show_calendar_heatmap = st.checkbox("🔥 Calendar Heatmap", value=True)
     show_statistics = st.checkbox("📊 Statistics", value=True)
 
+@st.cache_resource
 def load_stop_words(language):
     """Load stop words"""
     if language == "None":
-        return []
+        return frozenset()
     try:
-        with open(f'stop-words/{language}.txt', 'r', encoding='utf-8') as f:
-            return [line.strip().lower() for line in f if line.strip()]
+        return get_stop_words(language)
     except Exception as e:
         st.warning(f"Could not load stop words: {e}")
-        return []
+        return frozenset()
 
 def parse_chat_file(file_content, start_date=None, end_date=None):
     """Parse WhatsApp chat file with error handling"""
@@ -109,30 +111,16 @@ def parse_chat_file(file_content, start_date=None, end_date=None):
             if line.strip():
                 try:
                     chatline = Chatline(line)
-                    
-                    # Date filtering
-                    if start_date and end_date and chatline.timestamp:
-                        try:
-                            # Try multiple date formats
-                            for fmt in ['%d/%m/%y', '%m/%d/%y', '%Y-%m-%d']:
-                                try:
-                                    date_str = chatline.timestamp.split(',')[0].strip()
-                                    if '[' in date_str:
-                                        date_str = date_str.replace('[', '').split()[0]
-                                    msg_date = datetime.strptime(date_str, fmt).date()
-                                    if not (start_date <= msg_date <= end_date):
-                                        continue
-                                    break
-                                except:
-                                    continue
-                        except:
-                            pass
-                    
                     chats.append(chatline)
                 except Exception as e:
                     # Skip lines that can't be parsed
                     continue
         
+        # Date filtering on the parsed timestamps
+        if start_date and end_date:
+            time_index = TimeIndex.from_messages(chats)
+            chats = time_index.select(chats, time_index.locate(start_date, end_date))
+        
         return chats
     except Exception as e:
         st.error(f"Error parsing file: {e}")
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Test the local SQLite analytics store
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+from advanced_analyzer import AdvancedAnalyzer
+from analytics_store import AnalyticsStore
+from message_stream import iter_chatlines
+
+LINES = [
+    '[15/03/2020, 5:00:00 pm] A: hi\n',
+    'second line\n',
+    '[15/03/2020, 5:10:00 pm] B: hello\n',
+    '[20/04/2020, 9:00:00 am] A: morning\n',
+    '[20/04/2020, 9:05:00 am] A: are you up\n',
+]
+
+
+class TestAnalyticsStore(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = AnalyticsStore(os.path.join(self.tmp.name, 'analytics.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_ingest_fills_upload(self):
+        upload_id = self.store.ingest(iter_chatlines(LINES), 'chat.txt')
+        upload, = self.store.uploads()
+        journal, = self.store.connection.execute('PRAGMA journal_mode').fetchone()
+
+        self.assertEqual(journal, 'wal')
+        self.assertEqual(upload['id'], upload_id)
+        self.assertEqual(upload['total_messages'], 5)
+        self.assertEqual(upload['participants'], ['A', 'B'])
+        self.assertEqual(upload['date_start'], '2020-03-15 17:00:00')
+        self.assertEqual(upload['date_end'], '2020-04-20 09:05:00')
+        bodies = [body.strip() for _, body, _, _ in self.store.messages(upload_id, sender='A')]
+        self.assertEqual(bodies, ['hi', 'second line', 'morning', 'are you up'])
+
+    def test_counts_pushed_down(self):
+        first = self.store.ingest(iter_chatlines(LINES), 'one.txt')
+        self.store.ingest(iter_chatlines(LINES[2:]), 'two.txt')
+
+        self.assertEqual(self.store.counts_by_sender(first), [('A', 4), ('B', 1)])
+        self.assertEqual(self.store.counts_by_sender(), [('A', 6), ('B', 2)])
+        self.assertEqual(self.store.counts_by_month(), [('2020-03', 4), ('2020-04', 4)])
+
+        plan = ' '.join(row[-1] for row in self.store.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT sender, COUNT(*) FROM chat_messages '
+            'WHERE upload_id = ? GROUP BY sender', (first,)
+        ))
+        self.assertIn('idx_chat_messages_upload_sender', plan)
+
+    def test_analytics_and_cascade(self):
+        upload_id = self.store.ingest(iter_chatlines(LINES), 'chat.txt')
+        self.store.save_analytics(upload_id, {'top_senders': {'A': 4, 'B': 1}})
+
+        self.assertEqual(self.store.analytics(upload_id)['top_senders'], {'A': 4, 'B': 1})
+        self.assertIsNone(self.store.analytics(upload_id)['love_scores'])
+
+        self.store.delete_upload(upload_id)
+        self.assertEqual(self.store.uploads(), [])
+        self.assertEqual(self.store.counts_by_sender(), [])
+        self.assertIsNone(self.store.analytics(upload_id))
+
+    def test_analyzer_stores_parsed_chat(self):
+        chat_path = os.path.join(self.tmp.name, 'chat.txt')
+        with open(chat_path, 'w', encoding='utf-8') as file:
+            file.writelines(LINES)
+        analyzer = AdvancedAnalyzer(chat_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.load_file()
+            analyzer.parse_chats()
+            analyzer.process_data()
+            # Stored from the parsed lines, without reading the file again
+            os.remove(chat_path)
+            upload_id = analyzer.save_to_database(self.store.path)
+
+        self.assertEqual(self.store.counts_by_sender(upload_id), [('A', 4), ('B', 1)])
+        love_scores = self.store.analytics(upload_id)['love_scores']
+        self.assertEqual(sorted(s['sender'] for s in love_scores), ['A', 'B'])
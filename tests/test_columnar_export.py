@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Test the columnar export
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from columnar_export import read_npz_messages, write_columnar
+from message_stream import iter_chatlines
+
+LINES = [
+    '[23/10/2020, 5:00:00 pm] A: hi 😊\n',
+    '[23/10/2020, 5:10:00 pm] B: héllo there\n',
+    '[24/10/2020, 9:00:00 am] A: <Media omitted>\n',
+]
+
+
+class TestColumnarExport(TestCase):
+    def test_npz_round_trip_across_row_groups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'messages.npz')
+            rows = write_columnar(iter_chatlines(LINES), path, row_group_size=2)
+            data = read_npz_messages(path)
+
+            self.assertEqual(rows, 3)
+            self.assertIsInstance(data.timestamps, np.memmap)
+            self.assertEqual(data.senders, ['A', 'B'])
+            self.assertEqual(data.sender_codes.tolist(), [0, 1, 0])
+            self.assertEqual(str(data.timestamps[1]), '2020-10-23T17:10:00')
+            self.assertEqual(data.bodies()[:2], [' hi 😊', ' héllo there'])
+            self.assertEqual(data.body(1), ' héllo there')
+            self.assertEqual(data.emoji_counts.tolist()[0], 1)
+            del data
+
+    def test_failed_write_leaves_no_file(self):
+        def failing_lines():
+            yield from iter_chatlines(LINES)
+            raise RuntimeError("parse failure")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'messages.npz')
+            with self.assertRaises(RuntimeError):
+                write_columnar(failing_lines(), path, row_group_size=2)
+
+            self.assertEqual(os.listdir(tmp), [])
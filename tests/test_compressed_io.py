@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Test compressed export I/O
+"""
+
+import csv
+import gzip
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from compressed_io import (
+    available_codecs, codec_for_path, open_input, open_output, output_suffix, resolve_codec
+)
+
+ROWS = [['Sender', 'Message Count'], ['A', '2'], ['Bé 😊', '1']]
+
+
+class TestCompressedIO(TestCase):
+    def test_codec_choice(self):
+        self.assertEqual(codec_for_path('analysis.json.gz'), 'gzip')
+        self.assertEqual(codec_for_path('analysis.json.zst'), 'zstd')
+        self.assertIsNone(codec_for_path('analysis.json'))
+        self.assertEqual(resolve_codec('analysis.json', True), 'gzip')
+        self.assertEqual(output_suffix('gzip'), '.gz')
+        self.assertEqual(output_suffix(None), '')
+        with self.assertRaises(ValueError):
+            resolve_codec('analysis.json', 'bz2')
+
+    def test_gzip_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'analysis.csv')
+            with open_output(path, 'gzip', newline='') as file:
+                csv.writer(file).writerows(ROWS)
+            with gzip.open(path, 'rt', encoding='utf-8', newline='') as file:
+                self.assertEqual(list(csv.reader(file)), ROWS)
+            # The reader sniffs the codec, whatever the suffix says
+            with open_input(path, newline='') as file:
+                self.assertEqual(list(csv.reader(file)), ROWS)
+
+    def test_plain_files_stay_plain(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.html')
+            with open_output(path) as file:
+                file.write('<p>😊</p>')
+            with open(path, encoding='utf-8') as file:
+                self.assertEqual(file.read(), '<p>😊</p>')
+            with open_input(path) as file:
+                self.assertEqual(file.read(), '<p>😊</p>')
+
+    @skipUnless('zstd' in available_codecs(), "zstd not available")
+    def test_zstd_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'messages.ndjson.zst')
+            with open_output(path) as file:
+                file.write('{"sender": "A"}\n')
+            with open_input(path) as file:
+                self.assertEqual(file.read(), '{"sender": "A"}\n')
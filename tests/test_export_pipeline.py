@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Test the export pipeline
+"""
+
+import json
+from unittest import TestCase
+from export_pipeline import ExportPipeline, freeze, json_default
+
+
+class TestExportPipeline(TestCase):
+    def test_snapshot_is_read_only(self):
+        snapshot = freeze({'senders': [('A', 2)], 'overview': {'total_chats': 2}})
+
+        with self.assertRaises(TypeError):
+            snapshot['overview']['total_chats'] = 3
+        self.assertEqual(
+            json.loads(json.dumps(snapshot, default=json_default)),
+            {'senders': [['A', 2]], 'overview': {'total_chats': 2}}
+        )
+
+    def test_statistics_computed_once(self):
+        calls = []
+        seen = []
+
+        def get_statistics():
+            calls.append(1)
+            return {'total': 1}
+
+        pipeline = ExportPipeline(max_workers=3)
+        for name in ('json', 'csv', 'html'):
+            pipeline.register(name, lambda stats, name=name: seen.append(stats) or name + '-path')
+
+        paths = pipeline.run(get_statistics)
+
+        self.assertEqual(paths, {'json': 'json-path', 'csv': 'csv-path', 'html': 'html-path'})
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(stats is seen[0] for stats in seen))
+        with self.assertRaises(ValueError):
+            pipeline.run(get_statistics, ['pdf'])
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Test the HTML report renderer
+"""
+
+import json
+import os
+import re
+import tempfile
+from unittest import TestCase
+import html_report
+
+STATS = {
+    'overview': {'total_chats': 3, 'unique_senders': 2, 'unique_words': 4, 'unique_emojis': 1},
+    'senders': [('A', 2), ('B <script>', 1)],
+    'words': [('hello', 2)],
+    'emojis': [],
+    'domains': [('github.com', 1)],
+}
+
+
+class TestHtmlReport(TestCase):
+    def test_template_is_compiled_once(self):
+        chunks = html_report.compile_template()
+
+        self.assertIs(html_report.compile_template(), chunks)
+        self.assertIn('chart_data', [name for _, name in chunks])
+
+    def test_report_embeds_chart_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.html')
+            html_report.write_report(STATS, path)
+            with open(path, encoding='utf-8') as file:
+                page = file.read()
+
+        self.assertNotIn('{{', page)
+        self.assertNotIn('B <script>', page)
+        blob = re.search(r'<script id="chart-data" type="application/json">(.*?)</script>', page).group(1)
+        charts = json.loads(blob)
+        self.assertEqual(charts['senders'], [['A', 2], ['B <script>', 1]])
+        self.assertEqual(charts['emojis'], [])
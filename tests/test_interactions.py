@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Test the sender interaction matrix
+"""
+
+import datetime
+from unittest import TestCase
+from message_arrays import MessageArrays
+from interactions import InteractionMatrix
+
+
+class TestInteractionMatrix(TestCase):
+    def setUp(self):
+        senders = ['A', 'B', 'A', 'A', 'C', 'A', 'B']
+        start = datetime.datetime(2020, 10, 23, 17, 0)
+        times = [start + datetime.timedelta(minutes=i) for i in range(len(senders))]
+        self.arrays = MessageArrays.from_columns(times, senders)
+
+    def test_counts(self):
+        matrix = InteractionMatrix.from_arrays(self.arrays)
+
+        self.assertEqual(matrix.to_dict(), {'A': {'B': 2, 'C': 1}, 'B': {'A': 1}, 'C': {'A': 1}})
+        self.assertEqual(matrix.count('A', 'B'), 2)
+        self.assertEqual(matrix.count('B', 'C'), 0)
+
+    def test_queries(self):
+        matrix = InteractionMatrix.from_arrays(self.arrays)
+
+        self.assertEqual(matrix.top_reply_partners('A'), [('B', 3), ('C', 2)])
+        self.assertEqual(matrix.reply_probabilities('A'), {'B': 2 / 3, 'C': 1 / 3})
+
+    def test_sparse_matches_dense(self):
+        dense = InteractionMatrix.from_arrays(self.arrays)
+        sparse = InteractionMatrix.from_arrays(self.arrays, max_dense_senders=0)
+
+        self.assertTrue(sparse.is_sparse)
+        self.assertEqual(sparse.to_dict(), dense.to_dict())
+        self.assertEqual(sparse.top_reply_partners('A'), dense.top_reply_partners('A'))
+        self.assertEqual(sparse.transition_matrix().tolist(), dense.transition_matrix().tolist())
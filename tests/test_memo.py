@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Test the message body memo
+"""
+
+import sys
+import threading
+import time
+from unittest import TestCase
+from memo import Memo, normalize_body
+from sentiment_analyzer import SentimentAnalyzer
+
+
+class TestMemo(TestCase):
+    def test_shared_across_threads(self):
+        def slow_upper(text):
+            time.sleep(0)  # Yield mid-call so threads interleave
+            return text.upper()
+
+        memo = Memo(slow_upper, maxsize=8)
+        keys = [f'msg {i}' for i in range(12)]
+        errors = []
+
+        def hammer(offset):
+            try:
+                for i in range(3000):
+                    key = keys[(i * 7 + offset) % len(keys)]
+                    if memo(key) != key.upper():
+                        errors.append(key)
+            except Exception as error:
+                errors.append(error)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+        try:
+            threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(memo.hits + memo.misses, 8 * 3000)
+        self.assertLessEqual(len(memo), 8)
+
+    def test_lru_eviction_and_hit_rate(self):
+        calls = []
+        memo = Memo(lambda text: calls.append(text) or len(text), normalize=normalize_body, maxsize=2)
+
+        self.assertEqual(memo('OK'), 2)
+        self.assertEqual(memo('  ok '), 2)
+        memo('haha')
+        memo('ok')
+        memo('thanks')  # evicts 'haha', the least recently used
+        memo('haha')
+
+        self.assertEqual(calls, ['ok', 'haha', 'thanks', 'haha'])
+        self.assertEqual(len(memo), 2)
+        self.assertEqual(memo.info()['hits'], 2)
+        self.assertAlmostEqual(memo.hit_rate, 2 / 6)
+
+    def test_disabled(self):
+        memo = Memo(str.upper, maxsize=0)
+        memo('a')
+        memo('a')
+
+        self.assertEqual((memo.hits, memo.misses, len(memo)), (0, 2, 0))
+
+    def test_sentiment_repeats_hit_the_memo(self):
+        analyzer = SentimentAnalyzer('en')
+        analyzer.analyze_batch(['ok', 'thanks 😊', 'OK', 'ok', 'Thanks  😊'])
+
+        self.assertEqual(analyzer.cache_info()['hits'], 3)
+        self.assertEqual(analyzer.analyze_text('THANKS 😊'), analyzer.analyze_text('thanks 😊'))
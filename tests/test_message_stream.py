@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Test the message stream and NDJSON export
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+from unittest import TestCase
+from advanced_analyzer import AdvancedAnalyzer
+from message_stream import iter_chatlines, read_ndjson, write_ndjson
+
+LINES = [
+    '[23/10/2020, 5:00:00 pm] A: hi 😊\n',
+    'second line\n',
+    '[23/10/2020, 5:10:00 pm] B: hello there\n',
+]
+
+
+class TestMessageStream(TestCase):
+    def test_lines_only_keep_their_predecessor(self):
+        chatlines = list(iter_chatlines(LINES))
+
+        self.assertEqual(chatlines[1].sender, 'A')
+        self.assertIs(chatlines[2].previous_line, chatlines[1])
+        self.assertIsNone(chatlines[1].previous_line)
+
+    def test_gzip_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'messages.ndjson.gz')
+            count = write_ndjson(iter_chatlines(LINES), path)
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                self.assertEqual(len(file.readlines()), count)
+            records = list(read_ndjson(path))
+
+        self.assertEqual(count, 3)
+        self.assertEqual(records[0]['sender'], 'A')
+        self.assertEqual(records[0]['timestamp'], '2020-10-23T17:00:00')
+        self.assertEqual(records[0]['type'], 'Chat')
+        self.assertEqual(records[0]['emoji_count'], 1)
+        self.assertEqual(records[2]['word_count'], 2)
+
+    def test_export_reuses_parsed_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            chat_path = os.path.join(tmp, 'chat.txt')
+            with open(chat_path, 'w', encoding='utf-8') as file:
+                file.writelines(LINES)
+            analyzer = AdvancedAnalyzer(chat_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzer.load_file()
+                analyzer.parse_chats()
+            # The export must not parse the file again
+            os.remove(chat_path)
+            path = analyzer.export_messages(os.path.join(tmp, 'messages.ndjson'))
+            records = list(read_ndjson(path))
+
+        self.assertEqual([r['sender'] for r in records], ['A', 'A', 'B'])
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Test the reply analyzer
+"""
+
+import datetime
+import statistics
+from unittest import TestCase
+from chatline import Chatline
+from quantile_sketch import ReplyTimeSketch
+from reply_analyzer import ReplyAnalyzer, ReplyPoint, StreamingReplyAnalyzer
+from reply_scoring import score_interval, score_segments, score_series
+
+
+def chat(*lines):
+    chats = []
+    previous = None
+    for line in lines:
+        previous = Chatline(line, previous_line=previous)
+        chats.append(previous)
+    return chats
+
+
+class TestReplyAnalyzer(TestCase):
+    def setUp(self):
+        self.chats = chat(
+            '[23/10/2020, 5:00:00 pm] A: hi',
+            '[23/10/2020, 5:10:00 pm] B: hello',
+            '[23/10/2020, 5:12:00 pm] A: how are you',
+            '[23/10/2020, 5:13:00 pm] A: ?',
+            '[23/10/2020, 5:14:00 pm] C: hey all',
+            '[23/10/2020, 5:20:00 pm] B: good',
+            '[23/10/2020, 5:50:00 pm] A: nice',
+            '[23/10/2020, 5:53:00 pm] B: 👍',
+        )
+        self.analyzer = ReplyAnalyzer(self.chats)
+
+    def test_reply_series(self):
+        a_to_b, b_to_a = self.analyzer.build_reply_series('A', 'B')
+
+        self.assertEqual([(p.x, p.y) for p in a_to_b], [(1, 2.0), (2, 30.0)])
+        self.assertEqual([(p.x, p.y) for p in b_to_a], [(1, 10.0), (2, 3.0)])
+        self.assertEqual(a_to_b.y.tolist(), [2.0, 30.0])
+        self.assertEqual((a_to_b[-1].x, a_to_b[-1].y), (2, 30.0))
+        self.assertEqual(self.analyzer.compute_stats(a_to_b).median, 16.0)
+
+    def test_replies_are_bucketed_by_pair(self):
+        events = self.analyzer.events
+
+        self.assertEqual(len(events), 6)
+        self.assertEqual(events.reply_minutes('C', 'A').tolist(), [1.0])
+        self.assertEqual(events.reply_minutes('B', 'C').tolist(), [6.0])
+        self.assertEqual(events.reply_minutes('C', 'B').tolist(), [])
+
+    def test_analyze_pair(self):
+        result = self.analyzer.analyze_pair('A', 'B')['target']
+
+        self.assertEqual(result['reply_count'], 2)
+        self.assertEqual(result['median_reply_time'], 16.0)
+        self.assertEqual(result['std_dev'], round(statistics.stdev([2.0, 30.0]), 2))
+        self.assertEqual(result['fast_reply_rate'], 50.0)
+        self.assertEqual(result['trend_slope'], 28.0)
+
+    def test_love_score_interval(self):
+        # A constant series resamples to itself
+        score = round(score_series([3.0] * 6).score[0].item())
+        self.assertEqual(score_interval([3.0] * 6, seed=0), (score, score))
+
+        result = self.analyzer.analyze_pair('A', 'B', confidence=0.95)
+        low, high = result['target']['love_score_interval']
+        self.assertLessEqual(low, high)
+        self.assertNotIn('love_score_interval', self.analyzer.analyze_pair('A', 'B')['target'])
+
+        scores = self.analyzer.get_love_scores(confidence=0.9)
+        self.assertTrue(all('love_score_interval' in s for s in scores))
+
+    def test_find_best_pairs(self):
+        pairs = self.analyzer.find_best_pairs(top_n=3)
+
+        self.assertEqual(len(pairs), 3)
+        self.assertEqual(pairs, sorted(pairs, key=lambda x: x[2], reverse=True))
+
+    def test_find_best_pairs_skips_quiet_pairs(self):
+        # A-B exchanged 4 replies, A-C and B-C one each
+        graph = self.analyzer.reply_graph
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(sorted(graph.replies.tolist()), [1, 1, 4])
+
+        pairs = self.analyzer.find_best_pairs(top_n=3, min_replies=2)
+        self.assertEqual([(p1, p2) for p1, p2, _ in pairs], [('A', 'B')])
+        report = self.analyzer.analyze_pair('A', 'B')
+        self.assertEqual(pairs[0][2], report['comparison']['combined_love_score'])
+
+    def test_parallel_scoring_matches_serial(self):
+        parallel = ReplyAnalyzer(self.chats, parallel=True, max_workers=2)
+
+        self.assertEqual(parallel.find_best_pairs(top_n=3), self.analyzer.find_best_pairs(top_n=3))
+        serial = self.analyzer.score_all_pairs()
+        scores = parallel.score_all_pairs()
+        for field in scores.FIELDS:
+            self.assertEqual(getattr(scores, field).tolist(), getattr(serial, field).tolist())
+
+    def test_kernel_matches_scalar_statistics(self):
+        series = [[4.5, 1.0, 30.25, 2.0, 7.0], [], [12.0], [3.0, 3.0, 9.5, 0.5]]
+        offsets = [0]
+        for values in series:
+            offsets.append(offsets[-1] + len(values))
+        scores = score_segments([v for values in series for v in values], offsets)
+
+        for i, values in enumerate(series):
+            points = [ReplyPoint(x, y) for x, y in enumerate(values, 1)]
+            stats = self.analyzer.compute_stats(points)
+            regression = self.analyzer.compute_regression(points)
+            row = scores.row(i)
+
+            self.assertEqual(row['count'], len(values))
+            if values:
+                self.assertAlmostEqual(row['median'], statistics.median(values))
+                self.assertAlmostEqual(row['mean'], statistics.mean(values))
+            if len(values) > 1:
+                self.assertAlmostEqual(row['std'], statistics.stdev(values))
+            self.assertAlmostEqual(row['std'], stats.std)
+            if len(values) > 1:
+                # Closed-form least squares on x = 1..n
+                x = range(1, len(values) + 1)
+                slope, intercept = statistics.linear_regression(x, values)
+                r = statistics.correlation(x, values)
+                self.assertAlmostEqual(row['slope'], slope)
+                self.assertAlmostEqual(row['intercept'], intercept)
+                self.assertAlmostEqual(row['r2'], r * r)
+            else:
+                self.assertEqual(row['slope'], 0)
+                self.assertEqual(row['r2'], 0)
+
+    def test_regression_uses_point_x(self):
+        points = [ReplyPoint(x, y) for x, y in [(1, 4.0), (4, 2.5), (5, 9.0), (11, 1.0)]]
+        regression = self.analyzer.compute_regression(points)
+        slope, intercept = statistics.linear_regression([p.x for p in points], [p.y for p in points])
+
+        self.assertAlmostEqual(regression.slope, slope)
+        self.assertAlmostEqual(regression.intercept, intercept)
+
+    def test_streaming_matches_batch(self):
+        streaming = StreamingReplyAnalyzer()
+        replies = [streaming.update(c) for c in self.chats]
+
+        self.assertEqual(replies[1], ('B', 'A', 10.0))
+        self.assertIsNone(replies[3])
+        for target, counterpart in [('A', 'B'), ('B', 'A'), ('A', 'C'), ('C', 'B')]:
+            online = streaming.analyze_pair(target, counterpart)['target']
+            batch = self.analyzer.analyze_pair(target, counterpart)['target']
+
+            # The streaming median comes from a sketch with 1% relative error
+            self.assertAlmostEqual(online.pop('median_reply_time'), batch.pop('median_reply_time'),
+                                   delta=0.01 * batch['mean_reply_time'] + 0.01)
+            online.pop('score_breakdown')
+            batch.pop('score_breakdown')
+            self.assertEqual(online, batch)
+
+    def test_reply_time_percentiles(self):
+        # B replied after 10, 6 and 3 minutes
+        percentiles = self.analyzer.reply_time_percentiles('B', percentiles=(0, 50, 100))
+
+        self.assertAlmostEqual(percentiles['p0'], 3.0, delta=0.03)
+        self.assertAlmostEqual(percentiles['p50'], 6.0, delta=0.06)
+        self.assertAlmostEqual(percentiles['p100'], 10.0, delta=0.1)
+
+    def test_sketch_stores_only_used_buckets(self):
+        sketch = self.analyzer.reply_time_sketch('B')
+        merged = ReplyTimeSketch.from_dict(sketch.to_dict()).merge(sketch)
+
+        self.assertEqual(len(sketch.buckets), 3)
+        self.assertEqual(merged.count, 6)
+        self.assertAlmostEqual(merged.median(), 6.0, delta=0.06)
+        self.assertAlmostEqual(merged.fraction_within(6.5), 4 / 6)
+
+    def test_love_score_timeline(self):
+        chats = chat(
+            '[30/01/2020, 9:00:00 am] A: hi',
+            '[30/01/2020, 9:02:00 am] B: hey',
+            '[31/01/2020, 9:00:00 am] A: hi',
+            '[31/01/2020, 9:04:00 am] B: hey',
+            '[15/03/2020, 9:00:00 am] A: hi',
+            '[15/03/2020, 9:30:00 am] B: hey',
+        )
+        timeline = ReplyAnalyzer(chats).love_score_timeline('B', 'A', period='month')
+
+        self.assertEqual([row['start'] for row in timeline], [
+            datetime.date(2020, 1, 1), datetime.date(2020, 2, 1), datetime.date(2020, 3, 1)
+        ])
+        self.assertEqual(timeline[0]['end'], datetime.date(2020, 1, 31))
+        self.assertEqual([row['reply_count'] for row in timeline], [2, 0, 1])
+        self.assertEqual(timeline[0]['mean_reply_time'], 3.0)
+        self.assertEqual(timeline[0]['trend_slope'], 2.0)
+        self.assertEqual(timeline[1]['love_score'], 0)
+        self.assertAlmostEqual(timeline[2]['median_reply_time'], 30.0, delta=0.3)
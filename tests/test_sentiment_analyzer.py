@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Test the sentiment analyzer
+"""
+
+from unittest import TestCase, mock
+import config
+from chatline import Chatline
+from sentiment_analyzer import SentimentAnalyzer
+
+
+class TestSentimentAnalyzer(TestCase):
+    def setUp(self):
+        self.analyzer = SentimentAnalyzer('en')
+
+    def test_analyze_text(self):
+        result = self.analyzer.analyze_text('Good good, bad day 😊')
+
+        self.assertEqual(result['sentiment'], 'positive')
+        self.assertEqual((result['positive_words'], result['negative_words']), (3, 1))
+        self.assertEqual(result['score'], 0.5)
+        self.assertEqual(result['confidence'], 1.0)
+        self.assertEqual(self.analyzer.analyze_text('see you at 5')['sentiment'], 'neutral')
+
+    def test_language_packs_are_shared(self):
+        self.assertIs(SentimentAnalyzer('en').lexicon, SentimentAnalyzer('english').lexicon)
+        self.assertIn('terima kasih', SentimentAnalyzer('id').sentiment_words['positive'])
+        # Unknown languages fall back to English
+        self.assertIs(SentimentAnalyzer('klingon').lexicon, self.analyzer.lexicon)
+
+    def test_phrases(self):
+        result = SentimentAnalyzer('id').analyze_text('terima kasih ya ❤️')
+
+        self.assertEqual((result['positive_words'], result['negative_words']), (2, 0))
+
+    def test_negation_window(self):
+        self.assertEqual(self.analyzer.analyze_text('not good')['sentiment'], 'negative')
+        self.assertEqual(self.analyzer.analyze_text("I don't hate it")['sentiment'], 'positive')
+        self.assertEqual(self.analyzer.analyze_text("I don\u2019t hate it")['sentiment'], 'positive')
+        # A stray 't' is not a negator, only the whole contraction is
+        self.assertEqual(self.analyzer.analyze_text('plan t is bad')['sentiment'], 'negative')
+        # The window ends at the clause break
+        result = self.analyzer.analyze_text('not bad, great')
+        self.assertEqual((result['positive_words'], result['negative_words']), (2, 0))
+        result = self.analyzer.analyze_text('not a big deal, but a really really great day')
+        self.assertEqual(result['positive_words'], 1)
+
+    def test_aggregation_matches_result_dicts(self):
+        lines = [
+            '[23/10/2020, 5:00:00 pm] A: good morning 😊',
+            '[23/10/2020, 5:10:00 pm] B: bad traffic',
+            '[24/10/2020, 9:00:00 am] A: not great',
+            '[15/11/2020, 9:00:00 am] B: thanks, nice',
+            '[15/11/2020, 9:05:00 am] C: ok',
+        ]
+        messages = []
+        for line in lines:
+            messages.append(Chatline(line, previous_line=messages[-1] if messages else None))
+        scores, arrays = self.analyzer.analyze_chat(messages)
+
+        by_sender = self.analyzer.aggregate_by_sender(scores, arrays.codes, arrays.senders)
+        expected = self.analyzer.get_sender_sentiment(self.analyzer.analyze_conversation(messages))
+        self.assertEqual(by_sender, expected)
+
+        monthly = self.analyzer.aggregate_by_period(scores, arrays.times, 'month')
+        self.assertEqual(monthly['start'].astype(str).tolist(), ['2020-10-01', '2020-11-01'])
+        self.assertEqual(monthly['count'].tolist(), [3, 2])
+        self.assertEqual(monthly['positive'].tolist(), [1, 1])
+        self.assertEqual(monthly['negative'].tolist(), [2, 0])
+        self.assertAlmostEqual(monthly['mean_score'][0], -1 / 3)
+
+        # A subset of the scores aggregates like scoring the subset alone
+        november = scores.take(slice(3, 5))
+        self.assertEqual(
+            self.analyzer.aggregate_by_sender(november, arrays.codes[3:], arrays.senders),
+            self.analyzer.get_sender_sentiment(self.analyzer.analyze_conversation(messages[3:]))
+        )
+
+    def test_batch_matches_single_texts(self):
+        texts = ['I love this 😊', 'This is terrible 😢', 'Just a message', '', 'good but sad sad']
+        messages = texts + [Chatline('[23/10/2020, 5:00:00 pm] A: awful 👎')]
+        scores = self.analyzer.analyze_batch(messages)
+
+        self.assertEqual(len(scores), len(messages))
+        for i, text in enumerate(texts + ['awful 👎']):
+            result = self.analyzer.analyze_text(text)
+            self.assertEqual(scores.sentiments()[i], result['sentiment'])
+            self.assertAlmostEqual(scores.score[i], result['score'])
+            self.assertAlmostEqual(scores.confidence[i], result['confidence'])
+
+    def test_parallel_counts_match(self):
+        texts = ['good 😊', None, 'not bad, awful', 'ok'] * 3
+
+        # Chunks of 5 texts: three chunks, the last one short
+        with mock.patch.object(config, 'SENTIMENT_CHUNK_SIZE', 5):
+            parallel = self.analyzer._count_parallel(texts, max_workers=2)
+        serial = self.analyzer.count_texts(texts)
+        for got, expected in zip(parallel, serial):
+            self.assertEqual(got.tolist(), expected.tolist())
+
+    def test_batch_is_serial_by_default(self):
+        texts = ['good 😊', 'awful'] * 3
+        with mock.patch.object(config, 'SENTIMENT_PARALLEL_MIN_MESSAGES', 0), \
+                mock.patch.object(config, 'SENTIMENT_CHUNK_SIZE', 2), \
+                mock.patch.object(SentimentAnalyzer, '_count_parallel') as count_parallel:
+            scores = self.analyzer.analyze_batch(texts, max_workers=2)
+
+        count_parallel.assert_not_called()
+        self.assertEqual(scores.sentiments(), ['positive', 'negative'] * 3)
+
+    def test_parallel_processing_switch(self):
+        texts = ['good 😊', 'awful'] * 3
+        with mock.patch.object(config, 'PARALLEL_PROCESSING', False), \
+                mock.patch.object(config, 'SENTIMENT_PARALLEL_MIN_MESSAGES', 0), \
+                mock.patch.object(config, 'SENTIMENT_CHUNK_SIZE', 2), \
+                mock.patch('os.cpu_count', return_value=4), \
+                mock.patch.object(SentimentAnalyzer, '_count_parallel') as count_parallel:
+            scores = self.analyzer.analyze_batch(texts, parallel=True, max_workers=2)
+
+        count_parallel.assert_not_called()
+        self.assertEqual(scores.sentiments(), ['positive', 'negative'] * 3)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Test gap-based conversation sessionization
+"""
+
+import datetime
+from unittest import TestCase
+from message_arrays import MessageArrays
+from sessions import sessionize
+
+
+def minutes(*offsets):
+    start = datetime.datetime(2020, 10, 23, 17, 20)
+    return [start + datetime.timedelta(minutes=m) for m in offsets]
+
+
+class TestSessions(TestCase):
+    def setUp(self):
+        # 17:20-17:35 (crosses :30), then 2h of silence
+        self.arrays = MessageArrays.from_columns(
+            minutes(0, 5, 12, 15, 135, 140),
+            ['A', 'B', 'A', 'B', 'B', 'A']
+        )
+
+    def test_split_on_gap_not_clock(self):
+        index = sessionize(self.arrays, gap_minutes=30)
+
+        self.assertEqual(index.starts.tolist(), [0, 4])
+        self.assertEqual(index.ends.tolist(), [4, 6])
+
+    def test_starters_and_enders(self):
+        index = sessionize(self.arrays, gap_minutes=30)
+
+        self.assertEqual(index.initiator_counts(), [('A', 1), ('B', 1)])
+        self.assertEqual([self.arrays.senders[c] for c in index.enders], ['B', 'A'])
+
+    def test_participants(self):
+        index = sessionize(self.arrays, gap_minutes=1)
+
+        self.assertEqual(len(index), 6)
+        self.assertEqual(index.participant_counts().tolist(), [1] * 6)
+        self.assertEqual(index.participants(0), ['A'])
+
+    def test_empty(self):
+        index = sessionize(MessageArrays.from_columns([], []))
+
+        self.assertEqual(len(index), 0)
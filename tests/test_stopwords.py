@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Test the stop words registry
+"""
+
+from unittest import TestCase
+import stopwords
+
+
+class TestStopWords(TestCase):
+    def test_code_and_name_resolve_to_same_set(self):
+        self.assertIs(stopwords.load_language('en'), stopwords.load_language('english'))
+
+    def test_union_of_languages(self):
+        english = stopwords.load_language('english')
+        indonesian = stopwords.load_language('indonesian')
+
+        self.assertEqual(stopwords.get_stop_words(['en', 'id']), english | indonesian)
+
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            stopwords.get_stop_words('klingon')
+
+    def test_word_filter(self):
+        is_countable = stopwords.make_word_filter(stopwords.get_stop_words('english'))
+
+        self.assertTrue(is_countable('banana'))
+        self.assertFalse(is_countable('The'))
+        self.assertFalse(is_countable('2020'))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Test the sorted time index
+"""
+
+import datetime
+from unittest import TestCase
+from chatline import Chatline
+from time_index import TimeIndex
+
+
+class TestTimeIndex(TestCase):
+    def setUp(self):
+        self.chats = [
+            Chatline('[23/10/2020, 5:00:00 pm] A: one'),
+            Chatline('[24/10/2020, 9:00:00 am] B: two'),
+            Chatline('[24/10/2020, 11:00:00 pm] A: three'),
+            Chatline('[26/10/2020, 8:00:00 am] B: four'),
+        ]
+        self.index = TimeIndex.from_messages(self.chats)
+
+    def test_locate_is_inclusive(self):
+        span = self.index.locate(datetime.date(2020, 10, 24), datetime.date(2020, 10, 26))
+
+        self.assertEqual(self.index.select(self.chats, span), self.chats[1:])
+        self.assertEqual(self.index.sender_counts(span), {'A': 1, 'B': 2})
+
+    def test_daily_counts(self):
+        days, counts = self.index.daily_counts()
+
+        self.assertEqual(days.astype(object).tolist(), [
+            datetime.date(2020, 10, 23), datetime.date(2020, 10, 24), datetime.date(2020, 10, 26)
+        ])
+        self.assertEqual(counts.tolist(), [1, 2, 1])
+        self.assertEqual(self.index.count(datetime.date(2020, 10, 24), datetime.date(2020, 10, 25)), 2)
+
+    def test_hour_and_weekday_counts(self):
+        self.assertEqual(self.index.hour_counts()[[8, 9, 17, 23]].tolist(), [1, 1, 1, 1])
+        # Fri, Sat, Sat, Mon
+        self.assertEqual(self.index.weekday_counts().tolist(), [1, 0, 0, 0, 1, 2, 0])
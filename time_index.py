@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Time Index for WhatsApp Analyzer
+Sorted datetime64 index over parsed messages for instant date-range
+filtering and prefix-summed daily counts
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+
+
+def _to_day(value):
+    """datetime/date/string -> datetime64[D]"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+PERIODS = ('day', 'week', 'month')
+
+
+def period_ids(times, period):
+    """
+    Integer calendar period of each datetime64 timestamp ('day', 'week'
+    starting Monday, 'month' or a number of days), and a function mapping
+    a period id back to its start date
+    """
+    if period == 'month':
+        ids = times.astype('datetime64[M]').astype(np.int64)
+        return ids, lambda i: np.datetime64(int(i), 'M').astype('datetime64[D]')
+    days = times.astype('datetime64[D]').astype(np.int64)
+    if period == 'day':
+        return days, lambda i: np.datetime64(int(i), 'D')
+    if period == 'week':
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        return (days + 3) // 7, lambda i: np.datetime64(int(i) * 7 - 3, 'D')
+    if isinstance(period, int) and period > 0:
+        return days // period, lambda i: np.datetime64(int(i) * period, 'D')
+    raise ValueError(f"period must be one of {PERIODS} or a number of days, got {period!r}")
+
+
+class TimeIndex:
+    """
+    Messages sorted by timestamp.
+    - times: sorted datetime64[s] array
+    - positions: index of each sorted entry in the original message list
+    - days / cumulative: distinct days and prefix sums of messages per day
+
+    Range lookups are binary searches returning a slice into the sorted
+    arrays, so filtering costs O(log n) regardless of chat size.
+    """
+
+    def __init__(self, times, positions, codes=None, senders=None):
+        self.times = times
+        self.positions = positions
+        self.codes = codes
+        self.senders = senders or []
+
+        days = times.astype('datetime64[D]')
+        self.days, first = np.unique(days, return_index=True)
+        self.cumulative = np.append(first, len(times)).astype(np.int64)
+
+    @classmethod
+    def from_messages(cls, messages):
+        """Index Chatline-like objects; lines without a timestamp are left out"""
+        timestamps = []
+        positions = []
+        senders = []
+        for pos, m in enumerate(messages):
+            timestamp = getattr(m, 'timestamp', None)
+            if isinstance(timestamp, datetime):
+                timestamps.append(timestamp)
+                positions.append(pos)
+                senders.append(getattr(m, 'sender', None) or '')
+
+        times = np.array(timestamps, dtype='datetime64[s]')
+        order = np.argsort(times, kind='stable')
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(s, len(index)) for s in senders),
+            dtype=np.int32, count=len(senders)
+        )
+        return cls(
+            times[order],
+            np.asarray(positions, dtype=np.int64)[order],
+            codes[order],
+            list(index)
+        )
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def first_date(self):
+        return self.days[0].astype(date) if len(self.days) else None
+
+    @property
+    def last_date(self):
+        return self.days[-1].astype(date) if len(self.days) else None
+
+    def locate(self, start=None, end=None):
+        """Slice of messages whose date lies in [start, end] (inclusive, either may be None)"""
+        lo = 0 if start is None else np.searchsorted(self.times, _to_day(start), 'left')
+        hi = len(self.times) if end is None else np.searchsorted(
+            self.times, _to_day(end) + np.timedelta64(1, 'D'), 'left'
+        )
+        return slice(int(lo), int(max(lo, hi)))
+
+    def select(self, items, span=slice(None)):
+        """Items of the original message list falling in span, in time order"""
+        return [items[i] for i in self.positions[span].tolist()]
+
+    def _day_bounds(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self.days, _to_day(start), 'left')
+        hi = len(self.days) if end is None else np.searchsorted(self.days, _to_day(end), 'right')
+        return int(lo), int(max(lo, hi))
+
+    def count(self, start=None, end=None):
+        """Number of messages between two dates, from the daily prefix sums"""
+        lo, hi = self._day_bounds(start, end)
+        return int(self.cumulative[hi] - self.cumulative[lo])
+
+    def daily_counts(self, start=None, end=None):
+        """(days, counts) for the active days between two dates"""
+        lo, hi = self._day_bounds(start, end)
+        return self.days[lo:hi], np.diff(self.cumulative[lo:hi + 1])
+
+    def sender_counts(self, span=slice(None)):
+        """{sender: message count} within span"""
+        counts = np.bincount(self.codes[span], minlength=len(self.senders))
+        return {
+            self.senders[c]: int(n)
+            for c, n in enumerate(counts.tolist()) if n and self.senders[c]
+        }
+
+    def hour_counts(self, span=slice(None)):
+        """Messages per hour of day (length-24 array) within span"""
+        times = self.times[span]
+        hours = (times.astype('datetime64[h]') - times.astype('datetime64[D]')).astype(np.int64)
+        return np.bincount(hours, minlength=24)
+
+    def weekday_counts(self, span=slice(None)):
+        """Messages per weekday, Monday first (length-7 array) within span"""
+        days = self.times[span].astype('datetime64[D]').astype(np.int64)
+        # 1970-01-01 was a Thursday
+        return np.bincount((days + 3) % 7, minlength=7)
@@ -10,6 +10,7 @@ import emoji
 # imported from current directory
 from chatline import Chatline
 from font_color import Color
+from stopwords import get_stop_words, make_word_filter
 
 
 """
@@ -63,11 +64,10 @@ except IOError as e:
     print("File \"" + args.file + "\" not found. Please recheck your file location")
     sys.exit()
 
-stop_words = []
+stop_words = frozenset()
 if args.stopword:
     try:
-        with io.open("stop-words/" + args.stopword + ".txt", "r", encoding="utf-8") as file:
-            stop_words = [x.strip() for x in file.readlines()]
+        stop_words |= get_stop_words(args.stopword)
     except IOError as e:
         print("Stop Words file not found in \"" + args.file + "\" not found.")
         sys.exit()
@@ -75,8 +75,7 @@ if args.stopword:
 
 if args.customstopword:
     try:
-        with io.open(args.customstopword, "r", encoding="utf-8") as file:
-            stop_words = [x.strip() for x in file.readlines()]
+        stop_words |= get_stop_words(custom_files=args.customstopword)
     except IOError as e:
         print("Stop Words file not found in \"" + args.file + "\" not found.")
         sys.exit()
@@ -150,13 +149,12 @@ def reduce_and_sort(data):
         reverse=True
     )
 
+filter_single_word = make_word_filter(stop_words, min_length=1)
+
 def reduce_and_filter_words(list_of_words):
-    val = [w.lower() for w in list_of_words if (len(w) > 1) and (w.isalnum()) and (not w.isnumeric()) and (w.lower() not in stop_words)]
+    val = [w.lower() for w in list_of_words if filter_single_word(w)]
     return val
 
-def filter_single_word(w):
-    return (len(w) > 1) and (w.isalnum()) and (not w.isnumeric()) and (w.lower() not in stop_words)
-
 def reduce_fav_item(data):
     exist = []
     arr = []